@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
 from enum import Enum
+from typing import Any, Optional
 
 from PIL import Image  # type: ignore
 
@@ -9,11 +11,29 @@ class SlideType(Enum):
     HALF_WIDTH = 2
 
 
+# For slides whose output only changes when new data arrives.
+VALID_INDEFINITELY = datetime.max.replace(tzinfo=timezone.utc)
+
+
 class AbstractSlide(ABC):
 
     def is_enabled(self) -> bool:
         return True
 
+    # Slides that change on every frame should return true so the show renders at full rate.
+    def is_animating(self) -> bool:
+        return False
+
+    # Returns a value that compares equal for as long as the slide's output stays the same,
+    # so a previous render can be reused. None means the output can't be cached.
+    def get_cache_key(self) -> Any:
+        return None
+
+    # Returns the next time the slide's output can change by itself, rather than from new data arriving,
+    # so the show can sleep until then. None means it can change at any time.
+    def get_valid_until(self, now: datetime) -> Optional[datetime]:
+        return None
+
     @abstractmethod
     def get_type(self) -> SlideType:
         pass
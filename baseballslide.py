@@ -2,12 +2,12 @@ import datetime
 import logging
 from dataclasses import dataclass
 from json import JSONDecodeError
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 import requests
 from PIL import Image, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide, SlideType
+from abstractslide import VALID_INDEFINITELY, AbstractSlide, SlideType
 from deps import Dependencies
 from drawing import (AQUA, GRAY, ORANGE, RED, WHITE, Align, draw_glyph_by_name,
                      draw_string)
@@ -66,6 +66,7 @@ class BaseballSlide(AbstractSlide):
             refresh_interval=datetime.timedelta(minutes=1),
             parse_callback=self._parse_game_stats,
             error_callback=self._handle_game_stats_error,
+            unchanged_callback=self._game_stats_unchanged,
         ))
 
     def game_id_url_callback(self) -> Optional[str]:
@@ -236,6 +237,10 @@ class BaseballSlide(AbstractSlide):
         # Don't reset other data about the game, just the live scores.
         self.score = None
 
+    def _game_stats_unchanged(self) -> bool:
+        # Anything that resets the game state also clears the score, in which case identical stats are parsed again.
+        return self.score is not None
+
     def _reset_state(self) -> None:
         self.game_id = None
         self.game_start = None
@@ -252,6 +257,12 @@ class BaseballSlide(AbstractSlide):
             self.time_source.now() - self.last_event_time) < datetime.timedelta(hours=1)
         return self.game_started and self.score is not None and (not self.game_concluded or game_end_within_threshold)
 
+    def get_cache_key(self) -> Any:
+        return (self.score, self.game_concluded)
+
+    def get_valid_until(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        return VALID_INDEFINITELY
+
     def draw(self, img: Image) -> None:
         draw = ImageDraw.Draw(img)
 
@@ -7,7 +7,7 @@ from typing import Any, Dict, Optional
 import requests
 from PIL import Image, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide, SlideType
+from abstractslide import VALID_INDEFINITELY, AbstractSlide, SlideType
 from deps import Dependencies
 from drawing import AQUA, GRAY, WHITE, Align, Color, draw_string
 from glyphs import GlyphSet
@@ -56,6 +56,7 @@ class BasketballSlide(AbstractSlide):
             refresh_interval=datetime.timedelta(minutes=1),
             parse_callback=self._parse_scoreboard,
             error_callback=self._handle_game_stats_error,
+            unchanged_callback=self._game_stats_unchanged,
         ))
 
     def _parse_game_start_time(self, response: requests.models.Response) -> bool:
@@ -182,6 +183,10 @@ class BasketballSlide(AbstractSlide):
         # Don't reset other data about the game, just the live scores.
         self.score = None
 
+    def _game_stats_unchanged(self) -> bool:
+        # Anything that resets the game state also clears the score, in which case identical stats are parsed again.
+        return self.score is not None
+
     def _find_game_in_schedule(self, data: Any) -> Any:
         if "rollingSchedule" not in data:
             logging.debug("Data contained no rollingSchedule")
@@ -242,6 +247,12 @@ class BasketballSlide(AbstractSlide):
             self.time_source.now() - self.game_start_time) < datetime.timedelta(hours=4)
         return self.score is not None and self.game_started and (not self.game_concluded or game_end_within_threshold)
 
+    def get_cache_key(self) -> Any:
+        return (self.score, self.game_concluded)
+
+    def get_valid_until(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        return VALID_INDEFINITELY
+
     def draw(self, img: Image) -> None:
         draw = ImageDraw.Draw(img)
 
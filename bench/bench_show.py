@@ -0,0 +1,135 @@
+import argparse
+import statistics
+import threading
+import time
+from test.testing import FakeRequester, TestDependencies
+from typing import Dict, List
+
+from PIL import Image  # type: ignore
+
+from bench.benchutils import Results, add_report_arguments, report
+from bench.fixtures import SLIDE_FIXTURES
+from config import Config, load_config
+from display import Display
+from profiler import PROFILER
+from requester import Endpoint, Requester
+from show import Show
+from timesource import SystemTimeSource
+
+parser = argparse.ArgumentParser(
+    description='Runs the whole show against recorded responses and a fake display, and measures its throughput.')
+parser.add_argument('--seconds', type=float, default=20,
+                    help='How long to run the show for.')
+add_report_arguments(parser)
+
+# Short enough that even brief runs include several transitions.
+_BENCHMARK_SLIDE_ADVANCE = 2
+
+
+class CountingDisplay(Display):
+    # Accepts frames without showing them anywhere.
+    frames_drawn: int
+
+    def __init__(self) -> None:
+        self.frames_drawn = 0
+
+    def draw(self, img: Image) -> None:
+        self.frames_drawn += 1
+        super().draw(img)
+
+
+class FixtureRequester(Requester):
+    # Each slide has its own fake requester, holding the recorded responses it expects.
+    requesters: List[FakeRequester]
+
+    def __init__(self, requesters: List[FakeRequester]) -> None:
+        self.requesters = requesters
+
+    def add_endpoint(self, endpoint: Endpoint) -> None:
+        raise AssertionError("Slides add endpoints to their own requesters")
+
+    def start(self) -> None:
+        for requester in self.requesters:
+            requester.start()
+        if self.on_update is not None:
+            self.on_update()
+
+    def stop(self) -> None:
+        pass
+
+    def wait_until_ready(self, timeout: float) -> bool:
+        return all(requester.wait_until_ready(timeout) for requester in self.requesters)
+
+
+def benchmark_show(config: Config, seconds: float) -> Dict[str, float]:
+    # Every slide is frozen at the time its responses were recorded, so each uses its own dependencies.
+    all_deps = []
+    slides = []
+    for fixture in SLIDE_FIXTURES:
+        deps = TestDependencies()
+        slides.append(fixture.create(deps))
+        all_deps.append(deps)
+    requester = FixtureRequester([deps.requester for deps in all_deps])
+
+    # Draw every frame at the full rate, so the result shows whether the target rate can be sustained.
+    config = config.copy()
+    config["slide_advance"] = _BENCHMARK_SLIDE_ADVANCE
+    config["idle_fps"] = config.get("target_fps", 30)
+    config["max_idle_seconds"] = 0
+    config["profile_rendering"] = True
+    PROFILER.reset()
+
+    display = CountingDisplay()
+    show = Show(config, display, requester, SystemTimeSource(),
+                slides[0], slides[1:])
+    show.startup_complete()
+    start_time = time.perf_counter()
+    start_cpu = time.process_time()
+    time.sleep(seconds)
+    thread_count = threading.active_count()
+    show.stop()
+    elapsed = time.perf_counter() - start_time
+    cpu = time.process_time() - start_cpu
+
+    frame_times = sorted(show.frame_scheduler.frame_times)
+    profile = show.get_profile_stats()
+    merges = [stats for name, stats in profile.items()
+              if name.startswith("merge:")]
+    frames = max(display.frames_drawn, 1)
+    return {
+        "fps": display.frames_drawn / elapsed,
+        "frame_time_p50": statistics.median(frame_times),
+        "frame_time_p95": frame_times[int(0.95 * (len(frame_times) - 1))],
+        "frame_time_max": frame_times[-1],
+        "cpu_seconds_per_frame": cpu / frames,
+        "transition_frames": sum(stats.count for stats in merges),
+        "transition_merge_p95": max((stats.p95 for stats in merges), default=0),
+        "frames_skipped_by_display": display.get_stats().frames_skipped,
+        "threads": thread_count,
+    }
+
+
+def describe(metrics: Dict[str, float]) -> str:
+    return ("\n" + " " * 27).join([
+        "%.1f fps, %d threads" % (metrics["fps"], metrics["threads"]),
+        "frame time p50 %.2fms, p95 %.2fms, max %.2fms" % (
+            metrics["frame_time_p50"] * 1000, metrics["frame_time_p95"] * 1000, metrics["frame_time_max"] * 1000),
+        "%.2fms CPU per frame" % (metrics["cpu_seconds_per_frame"] * 1000),
+        "%d transition frames, merge p95 %.2fms" % (
+            metrics["transition_frames"], metrics["transition_merge_p95"] * 1000),
+        "%d identical frames not pushed to the display" % metrics["frames_skipped_by_display"],
+    ])
+
+
+def run(seconds: float, args: argparse.Namespace) -> None:
+    results: Results = {"show": benchmark_show(load_config(), seconds)}
+    report(results, args, "cpu_seconds_per_frame", describe)
+
+
+def main() -> None:
+    args = parser.parse_args()
+    run(args.seconds, args)
+
+
+if __name__ == "__main__":
+    main()
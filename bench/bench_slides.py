@@ -0,0 +1,46 @@
+import argparse
+from test.testing import TestDependencies
+from typing import Dict
+
+from bench.benchutils import (Results, add_report_arguments,
+                              peak_bytes_per_call, report, seconds_per_call)
+from bench.fixtures import SLIDE_FIXTURES, SlideFixture
+from drawing import create_slide
+
+parser = argparse.ArgumentParser(
+    description='Measures the cost of drawing each slide type, using the recorded test responses.')
+parser.add_argument('--draws', type=int, default=2000,
+                    help='Number of times to draw each slide.')
+parser.add_argument('--allocation_draws', type=int, default=100,
+                    help='Number of draws used to measure memory allocation, which is slower to trace.')
+add_report_arguments(parser)
+
+
+def benchmark_slide(fixture: SlideFixture, draws: int, allocation_draws: int) -> Dict[str, float]:
+    deps = TestDependencies()
+    slide = fixture.create(deps)
+    deps.requester.start()
+    # Otherwise the fixtures no longer match what the slide expects, and the numbers would be for a blank slide.
+    if not slide.is_enabled():
+        raise AssertionError("%s is not enabled" % type(slide).__name__)
+    img = create_slide(slide.get_type())
+
+    # Draws go straight to the slide, bypassing any render caching.
+    seconds = seconds_per_call(lambda: slide.draw(img), draws)
+    return {
+        "seconds_per_draw": seconds,
+        "draws_per_second": 1 / seconds,
+        "peak_bytes_per_draw": peak_bytes_per_call(lambda: slide.draw(img), allocation_draws),
+    }
+
+
+def main() -> None:
+    args = parser.parse_args()
+    results: Results = {fixture.name: benchmark_slide(fixture, args.draws, args.allocation_draws)
+                        for fixture in SLIDE_FIXTURES}
+    report(results, args, "seconds_per_draw", lambda metrics: "%8.1f us/draw %9.0f draws/s %8.0f peak bytes/draw" % (
+        metrics["seconds_per_draw"] * 1e6, metrics["draws_per_second"], metrics["peak_bytes_per_draw"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageDraw, ImageEnhance  # type: ignore
+
+from abstractslide import SlideType
+from bench.benchutils import Results, add_report_arguments, report
+from drawing import GREEN, RED, Align, create_slide, draw_string
+from glyphs import GlyphSet
+from transitions import Transition, create_transition
+
+parser = argparse.ArgumentParser(
+    description='Measures the per-frame cost of each transition.')
+parser.add_argument('--transitions', type=int, default=60,
+                    help='Number of transitions to run for each transition type, each between new snapshots.')
+parser.add_argument('--frames_per_transition', type=int, default=30,
+                    help='Number of frames merged in each transition, about one second at the target frame rate.')
+add_report_arguments(parser)
+
+
+class LegacyFadeToBlack(Transition):
+    # Fade as it was implemented before quantized steps and blended frame reuse, kept as a point of comparison.
+    def merge(self, progress: float, img0: Image, img1: Image) -> Image:
+        if progress < 0.5:
+            return ImageEnhance.Brightness(img0).enhance(1-(progress*2))
+        else:
+            return ImageEnhance.Brightness(img1).enhance((progress-0.5)*2)
+
+
+def _create_snapshots() -> Tuple[Image, Image]:
+    img0 = create_slide(SlideType.FULL_WIDTH)
+    draw_string(ImageDraw.Draw(img0), "A" * 40, 0, 0,
+                Align.LEFT, GlyphSet.FONT_7PX, RED)
+    img1 = create_slide(SlideType.FULL_WIDTH)
+    draw_string(ImageDraw.Draw(img1), "B" * 40, 0, 24,
+                Align.LEFT, GlyphSet.FONT_7PX, GREEN)
+    return (img0, img1)
+
+
+def _merge_transition(t: Transition, img0: Image, img1: Image, frames: int) -> float:
+    start = time.perf_counter()
+    for i in range(frames):
+        t.merge(i / frames, img0, img1)
+    return time.perf_counter() - start
+
+
+def benchmark_transition(t: Transition, transitions: int, frames_per_transition: int) -> Dict[str, float]:
+    # Slideshows snapshot both slides at the start of each transition, so each one gets new images. The first
+    # pass is what a transition costs, and the second shows the cost of merging a frame that was merged before.
+    base_img0, base_img1 = _create_snapshots()
+    snapshots: List[Tuple[Image, Image]] = [(base_img0.copy(), base_img1.copy()) for _ in range(transitions)]
+    cold_seconds = 0.0
+    warm_seconds = 0.0
+    for img0, img1 in snapshots:
+        cold_seconds += _merge_transition(t, img0, img1, frames_per_transition)
+        warm_seconds += _merge_transition(t, img0, img1, frames_per_transition)
+    frames = transitions * frames_per_transition
+    return {
+        "seconds_per_frame": cold_seconds / frames,
+        "warm_seconds_per_frame": warm_seconds / frames,
+    }
+
+
+def main() -> None:
+    args = parser.parse_args()
+    transitions: Dict[str, Transition] = {
+        "legacy_fade_to_black": LegacyFadeToBlack(),
+    }
+    for name in ["fade_to_black", "crossfade", "wipe", "slide"]:
+        transitions[name] = create_transition(name)
+
+    results: Results = {name: benchmark_transition(t, args.transitions, args.frames_per_transition)
+                        for name, t in transitions.items()}
+    report(results, args, "seconds_per_frame", lambda metrics: "%8.1f us/frame %8.1f us/frame merged again" % (
+        metrics["seconds_per_frame"] * 1e6, metrics["warm_seconds_per_frame"] * 1e6))
+
+
+if __name__ == "__main__":
+    main()
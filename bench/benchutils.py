@@ -0,0 +1,75 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+# Results by benchmark case, then by metric name.
+Results = Dict[str, Dict[str, float]]
+
+_DEFAULT_TOLERANCE = 0.1
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--json', action='store_true',
+                        help='Prints results as JSON instead of a table. The output can be saved as a baseline.')
+    parser.add_argument('--baseline', type=str,
+                        help='JSON results from an earlier run to compare against. Exits with an error on regressions.')
+    parser.add_argument('--tolerance', type=float, default=_DEFAULT_TOLERANCE,
+                        help='Fraction a result can be slower than the baseline before it counts as a regression.')
+
+
+def seconds_per_call(fn: Callable[[], object], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def peak_bytes_per_call(fn: Callable[[], object], iterations: int) -> float:
+    # Mean of the highest Python memory use within each call. Pillow's pixel buffers aren't included.
+    total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            start_size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            _, peak_size = tracemalloc.get_traced_memory()
+            total += peak_size - start_size
+    finally:
+        tracemalloc.stop()
+    return total / iterations
+
+
+def report(results: Results, args: argparse.Namespace, metric: str, describe: Callable[[Dict[str, float]], str]) -> None:
+    # Metric is the result compared against the baseline, where lower is better.
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        for name, metrics in results.items():
+            print("%-26s %s" % (name, describe(metrics)))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline: Results = json.load(f)
+        regressions = _compare(results, baseline, metric, args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+def _compare(results: Results, baseline: Results, metric: str, tolerance: float) -> List[str]:
+    # Comparison goes to stderr so JSON output stays parseable.
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline or metric not in baseline[name]:
+            print("%-26s no baseline" % name, file=sys.stderr)
+            continue
+        change = metrics[metric] / baseline[name][metric] - 1
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(name)
+        print("%-26s %+7.1f%% %s" % (name, change * 100,
+              "REGRESSION" if regressed else ""), file=sys.stderr)
+    return regressions
@@ -0,0 +1,186 @@
+import argparse
+import datetime
+import time
+from abc import ABC, abstractmethod
+from test.testing import TestDependencies
+from typing import BinaryIO, Callable, List, Optional
+
+from PIL import Image  # type: ignore
+
+from bench.bench_show import FixtureRequester
+from bench.fixtures import get_slide_fixture
+from clock import SimulatedClock
+from config import Config, load_config
+from display import Display
+from imagewriter import render_grid
+from show import Show
+
+parser = argparse.ArgumentParser(
+    description='Records the show in simulated time, using the recorded test responses, as an animation or raw video.')
+parser.add_argument('output', type=str,
+                    help='File to write. The format comes from the extension: .gif, .png (animated) or .y4m.')
+parser.add_argument('--seconds', type=float, default=60,
+                    help='Length of show to record, in simulated time.')
+parser.add_argument('--fps', type=int, default=30,
+                    help='Frames per second of simulated time.')
+parser.add_argument('--scale', type=int, default=1,
+                    help='Size of each LED in pixels. Above 1, LEDs are drawn as dots like generated images.')
+
+# Simulated time starts here, so every export is the same.
+_START_TIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class FrameWriter(ABC):
+    @abstractmethod
+    def add_frame(self, img: Image) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class AnimationWriter(FrameWriter):
+    # Keeps each run of identical frames as a single frame shown for longer.
+    filename: str
+    fps: int
+    scale: int
+    frames: List[Image]
+    # Index of the first recorded frame in each run.
+    frame_starts: List[int]
+    frame_count: int
+    last_frame_bytes: Optional[bytes]
+
+    def __init__(self, filename: str, fps: int, scale: int) -> None:
+        self.filename = filename
+        self.fps = fps
+        self.scale = scale
+        self.frames = []
+        self.frame_starts = []
+        self.frame_count = 0
+        self.last_frame_bytes = None
+
+    def add_frame(self, img: Image) -> None:
+        frame_bytes = img.tobytes()
+        if frame_bytes != self.last_frame_bytes:
+            self.last_frame_bytes = frame_bytes
+            self.frames.append(_scale(img, self.scale))
+            self.frame_starts.append(self.frame_count)
+        self.frame_count += 1
+
+    def close(self) -> None:
+        if not self.frames:
+            return
+        # Round each frame's start time rather than its duration, so rounding errors don't add up.
+        start_millis = [round(start * 1000 / self.fps)
+                        for start in self.frame_starts + [self.frame_count]]
+        durations = [end - start for start,
+                     end in zip(start_millis, start_millis[1:])]
+        self.frames[0].save(self.filename, save_all=True, append_images=self.frames[1:],
+                            duration=durations, loop=0)
+
+
+class Y4mWriter(FrameWriter):
+    # Uncompressed video, one full frame for each recorded frame, which tools like ffmpeg can convert.
+    file: BinaryIO
+    fps: int
+    scale: int
+    last_frame_bytes: Optional[bytes]
+    last_frame_data: bytes
+
+    def __init__(self, filename: str, fps: int, scale: int) -> None:
+        self.file = open(filename, "wb")
+        self.fps = fps
+        self.scale = scale
+        self.last_frame_bytes = None
+        self.last_frame_data = b""
+
+    def add_frame(self, img: Image) -> None:
+        frame_bytes = img.tobytes()
+        if self.last_frame_bytes is None:
+            scaled_img = _scale(img, self.scale)
+            # Full resolution chroma and full range values, matching how Pillow converts to YCbCr.
+            self.file.write(b"YUV4MPEG2 W%d H%d F%d:1 Ip A1:1 C444 XCOLORRANGE=FULL\n" % (
+                scaled_img.width, scaled_img.height, self.fps))
+        # Converting is only needed when the frame changed.
+        if frame_bytes != self.last_frame_bytes:
+            self.last_frame_bytes = frame_bytes
+            planes = _scale(img, self.scale).convert("YCbCr").split()
+            self.last_frame_data = b"".join(plane.tobytes()
+                                            for plane in planes)
+        self.file.write(b"FRAME\n")
+        self.file.write(self.last_frame_data)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def create_writer(filename: str, fps: int, scale: int) -> FrameWriter:
+    if filename.endswith(".gif") or filename.endswith(".png"):
+        return AnimationWriter(filename, fps, scale)
+    elif filename.endswith(".y4m"):
+        return Y4mWriter(filename, fps, scale)
+    raise ValueError("Unsupported export format for %s" % filename)
+
+
+def _scale(img: Image, scale: int) -> Image:
+    if scale == 1:
+        return img.copy()
+    return render_grid(img, scale, padding=max(1, scale // 5))
+
+
+def export_show(show: Show, clock: SimulatedClock, seconds: float, fps: int, writer: FrameWriter, before_frame: Optional[Callable[[datetime.timedelta], None]] = None) -> int:
+    # Returns the number of frames recorded. Frames are drawn as fast as possible, each at its own simulated time.
+    start_time = clock.now()
+    show.startup_complete()
+    frame_count = int(seconds * fps)
+    for i in range(frame_count):
+        elapsed = datetime.timedelta(seconds=i / fps)
+        clock.advance_to(start_time + elapsed)
+        if before_frame is not None:
+            before_frame(elapsed)
+        img = show.draw_frame()
+        writer.add_frame(img)
+        show.release_frame(img)
+    writer.close()
+    show.stop()
+    return frame_count
+
+
+def export_fixture_show(config: Config, filename: str, seconds: float, fps: int, scale: int) -> int:
+    # The configured slides, each created from the fixture for its type. Responses were only recorded for the fixture's options,
+    # so those are used in place of the configured ones.
+    # Each slide is frozen at the time its responses were recorded, so its clock is moved along with the show's.
+    all_deps = []
+    slides = []
+    for slide_config in [config["static_slide"], *config["rotating_slides"]]:
+        deps = TestDependencies()
+        slides.append(get_slide_fixture(slide_config["type"]).create(deps))
+        all_deps.append(deps)
+    slide_start_times = [deps.time_source.now() for deps in all_deps]
+
+    def update_slide_clocks(elapsed: datetime.timedelta) -> None:
+        for deps, slide_start_time in zip(all_deps, slide_start_times):
+            deps.time_source.set(slide_start_time + elapsed)
+
+    clock = SimulatedClock(_START_TIME)
+    requester = FixtureRequester([deps.requester for deps in all_deps])
+    show = Show(config, Display(), requester, clock, slides[0], slides[1:],
+                clock=clock, run_threads=False)
+    return export_show(show, clock, seconds, fps, create_writer(filename, fps, scale), update_slide_clocks)
+
+
+def run(filename: str, seconds: float, fps: int, scale: int) -> None:
+    start = time.perf_counter()
+    frames = export_fixture_show(load_config(), filename, seconds, fps, scale)
+    print("Wrote %d frames (%.0f seconds of show) to %s in %.1f seconds" %
+          (frames, seconds, filename, time.perf_counter() - start))
+
+
+def main() -> None:
+    args = parser.parse_args()
+    run(args.output, args.seconds, args.fps, args.scale)
+
+
+if __name__ == "__main__":
+    main()
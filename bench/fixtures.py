@@ -0,0 +1,106 @@
+import datetime
+from dataclasses import dataclass
+from test.testing import FakeRequester, TestDependencies
+from typing import Callable, Dict, List
+
+from dateutil import tz
+
+from abstractslide import AbstractSlide
+from gtfs_realtime_pb2 import FeedMessage  # type: ignore
+from slideregistry import create_slide_from_config
+
+
+@dataclass(frozen=True)
+class SlideFixture:
+    # A slide frozen at the time its test responses were recorded.
+    # Name of the benchmark case.
+    name: str
+    # Slide type, as used in config.json.
+    type: str
+    # The recorded responses are for requests made with these options.
+    options: Dict[str, str]
+    time: datetime.datetime
+    expect_responses: Callable[[FakeRequester], None]
+
+    def create(self, deps: TestDependencies) -> AbstractSlide:
+        deps.time_source.set(self.time)
+        slide = create_slide_from_config(
+            {"type": self.type, "options": self.options}, deps)
+        self.expect_responses(deps.requester)
+        return slide
+
+
+_WEATHER_OPTIONS = {
+    "weather_lat": "1.2345",
+    "weather_lng": "-5.6789",
+    "openweather_api_key": "OW-API-KEY",
+    "airnow_zip_code": "12345",
+    "airnow_api_key": "API-KEY",
+}
+
+
+def _at(year: int, month: int, day: int, hour: int, minute: int) -> datetime.datetime:
+    return datetime.datetime(year, month, day, hour, minute, tzinfo=tz.gettz("America/New_York"))
+
+
+def _expect_time_and_temperature(requester: FakeRequester) -> None:
+    requester.expect("https://api.openweathermap.org/data/3.0/onecall?lat=1.2345&lon=-5.6789&exclude=minutely,hourly,daily,alerts&units=imperial&appid=OW-API-KEY",
+                     "timeandtemperatureslide_current.json")
+    requester.expect("https://www.airnowapi.org/aq/observation/zipCode/current/?format=application/json&zipCode=12345&API_KEY=API-KEY",
+                     "timeandtemperatureslide_airnow_high_aqi.json")
+
+
+def _expect_forecast(requester: FakeRequester) -> None:
+    requester.expect("https://api.openweathermap.org/data/3.0/onecall?lat=1.2345&lon=-5.6789&exclude=current,minutely,hourly,alerts&units=imperial&appid=OW-API-KEY",
+                     "forecastslide_afternoon.json")
+
+
+def _expect_nyc_subway(requester: FakeRequester) -> None:
+    requester.expect_with_proto_response("https://api-endpoint.mta.info/Dataservice/mtagtfsfeeds/nyct%2Fgtfs-nqrw",
+                                         "mta_nqrw.textproto", FeedMessage())
+    requester.expect_with_proto_response("https://api-endpoint.mta.info/Dataservice/mtagtfsfeeds/nyct%2Fgtfs-bdfm",
+                                         "mta_bdfm.textproto", FeedMessage())
+
+
+def _expect_baseball(requester: FakeRequester) -> None:
+    requester.expect("https://statsapi.mlb.com/api/v1/schedule/games/?sportId=1&startDate=2024-04-13&endDate=2024-04-13",
+                     "baseballslide_game_id.json")
+    requester.expect("https://statsapi.mlb.com/api/v1.1/game/12345/feed/live",
+                     "baseballslide_game_during.json")
+
+
+def _expect_basketball(requester: FakeRequester) -> None:
+    requester.expect("https://cdn.wnba.com/static/json/staticData/rollingSchedule.json",
+                     "basketballslide_schedule_game_today.json")
+    requester.expect("https://cdn.wnba.com/static/json/liveData/scoreboard/todaysScoreboard_10.json",
+                     "basketballslide_scoreboard_game_in_progress.json")
+
+
+def _expect_nothing(requester: FakeRequester) -> None:
+    pass
+
+
+# One fixture for each built-in slide type.
+SLIDE_FIXTURES: List[SlideFixture] = [
+    SlideFixture("time_and_temperature", "TimeAndTemperatureSlide", _WEATHER_OPTIONS,
+                 _at(2022, 5, 23, 12, 34), _expect_time_and_temperature),
+    SlideFixture("forecast", "ForecastSlide", _WEATHER_OPTIONS,
+                 _at(2025, 8, 2, 15, 31), _expect_forecast),
+    SlideFixture("nyc_subway", "NycSubwaySlide", {"mta_api_key": "API-KEY"},
+                 _at(2023, 10, 30, 17, 55), _expect_nyc_subway),
+    SlideFixture("baseball", "BaseballSlide", {"team_name": "New York Mets"},
+                 _at(2024, 4, 13, 13, 45), _expect_baseball),
+    SlideFixture("basketball", "BasketballSlide", {"team_code": "NYL"},
+                 _at(2024, 4, 13, 16, 1), _expect_basketball),
+    SlideFixture("christmas", "ChristmasSlide", {},
+                 _at(2022, 12, 22, 19, 31), _expect_nothing),
+    SlideFixture("internet_status", "InternetStatusSlide", {},
+                 _at(2023, 10, 30, 17, 55), _expect_nothing),
+]
+
+
+def get_slide_fixture(type: str) -> SlideFixture:
+    for fixture in SLIDE_FIXTURES:
+        if fixture.type == type:
+            return fixture
+    raise ValueError("No recorded responses for slide type %s" % type)
@@ -1,5 +1,5 @@
 import datetime
-from typing import List, Tuple
+from typing import Any, List, Optional, Tuple
 
 from PIL import Image, ImageDraw  # type: ignore
 
@@ -91,6 +91,13 @@ class ChristmasSlide(AbstractSlide):
     def get_type(self) -> SlideType:
         return SlideType.HALF_WIDTH
 
+    def get_cache_key(self) -> Any:
+        return self._days_until_christmas()
+
+    def get_valid_until(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        # The countdown changes once the time remaining drops below the next whole day.
+        return now + (self.christmas_date - now) % datetime.timedelta(days=1)
+
     def draw(self, img: Image) -> None:
         draw = ImageDraw.Draw(img)
         self._draw_tree(draw, 8, 2)
@@ -118,8 +125,11 @@ class ChristmasSlide(AbstractSlide):
             draw.point((x+i, y+j), c)
 
     def _draw_countdown(self, draw: ImageDraw, x: int) -> None:
-        # Add one day to account for the fraction of today remaining.
-        days = (self.christmas_date - self.time_source.now()).days + 1
+        days = self._days_until_christmas()
         draw_string(draw, str(days), x, 8, Align.CENTER,
                     GlyphSet.FONT_7PX, GREEN)
         draw_string(draw, "DAYS", x, 16, Align.CENTER, GlyphSet.FONT_7PX, RED)
+
+    def _days_until_christmas(self) -> int:
+        # Add one day to account for the fraction of today remaining.
+        return (self.christmas_date - self.time_source.now()).days + 1
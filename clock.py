@@ -0,0 +1,89 @@
+import datetime
+import heapq
+import threading
+from abc import abstractmethod
+from typing import Callable, List, Protocol, Tuple
+
+from timesource import TimeSource
+
+
+class TimerHandle(Protocol):
+    def cancel(self) -> None:
+        pass
+
+    def join(self) -> None:
+        pass
+
+    def is_alive(self) -> bool:
+        pass
+
+
+class Clock(TimeSource):
+    # A time source that can also run callbacks after a delay, so the show can run in simulated time.
+    @abstractmethod
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        pass
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime.datetime:
+        return datetime.datetime.now().astimezone()
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        timer = threading.Timer(delay, callback)
+        timer.start()
+        return timer
+
+
+class SimulatedTimer:
+    callback: Callable[[], None]
+    cancelled: bool
+    fired: bool
+
+    def __init__(self, callback: Callable[[], None]) -> None:
+        self.callback = callback
+        self.cancelled = False
+        self.fired = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def join(self) -> None:
+        # Callbacks run synchronously when the clock advances, so there is never one to wait for.
+        pass
+
+    def is_alive(self) -> bool:
+        return not self.cancelled and not self.fired
+
+
+class SimulatedClock(Clock):
+    # Time only moves when advanced, and timers that come due run on the advancing thread, in order.
+    current_time: datetime.datetime
+    # Due time, then order of creation so timers due at the same time run in the order they were set.
+    timers: List[Tuple[datetime.datetime, int, SimulatedTimer]]
+    timers_created: int
+
+    def __init__(self, start_time: datetime.datetime) -> None:
+        self.current_time = start_time
+        self.timers = []
+        self.timers_created = 0
+
+    def now(self) -> datetime.datetime:
+        return self.current_time
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> TimerHandle:
+        timer = SimulatedTimer(callback)
+        heapq.heappush(self.timers, (self.current_time +
+                       datetime.timedelta(seconds=delay), self.timers_created, timer))
+        self.timers_created += 1
+        return timer
+
+    def advance_to(self, time: datetime.datetime) -> None:
+        while self.timers and self.timers[0][0] <= time:
+            due_time, _, timer = heapq.heappop(self.timers)
+            if timer.cancelled:
+                continue
+            self.current_time = max(self.current_time, due_time)
+            timer.fired = True
+            timer.callback()
+        self.current_time = max(self.current_time, time)
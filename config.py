@@ -10,6 +10,14 @@ SlideConfig = TypedDict('SlideConfig', {
 Config = TypedDict('Config', {
     "slide_advance": int,
     "transition_millis": int,
+    "transition": str,
+    "target_fps": int,
+    "idle_fps": int,
+    "max_idle_seconds": int,
+    "frame_queue_depth": int,
+    "double_buffered_display": bool,
+    "profile_rendering": bool,
+    "http_pool_size": int,
     "static_slide": SlideConfig,
     "rotating_slides": List[SlideConfig],
 })
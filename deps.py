@@ -1,4 +1,5 @@
-from requester import HttpRequester, Requester
+from config import Config
+from requester import DEFAULT_POOL_SIZE, HttpRequester, Requester
 from timesource import SystemTimeSource, TimeSource
 
 
@@ -6,9 +7,10 @@ class Dependencies:
     _requester: Requester
     _time_source: TimeSource
 
-    def __init__(self) -> None:
+    def __init__(self, config: Config) -> None:
         self._time_source = SystemTimeSource()
-        self._requester = HttpRequester(self._time_source)
+        self._requester = HttpRequester(
+            self._time_source, config.get("http_pool_size", DEFAULT_POOL_SIZE))
 
     def get_time_source(self) -> TimeSource:
         return self._time_source
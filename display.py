@@ -1,21 +1,146 @@
-from abc import ABC, abstractmethod
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
 
-from PIL import Image  # type: ignore
-from rgbmatrix import RGBMatrix, RGBMatrixOptions  # type: ignore
+from PIL import Image, ImageChops  # type: ignore
+
+try:
+    from rgbmatrix import RGBMatrix, RGBMatrixOptions  # type: ignore
+except ImportError:
+    # Bindings are only installed on the device, the emulated matrix can be used elsewhere.
+    RGBMatrix = None
+    RGBMatrixOptions = None
+
+from constants import GRID_HEIGHT, GRID_WIDTH
+
+_REFRESH_RATE_HZ = 120
+
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class DisplayStats:
+    frames_presented: int
+    # Frames identical to the one already on the display, which weren't pushed at all.
+    frames_skipped: int
+    # Presented frames where only the changed area was pushed.
+    partial_updates: int
 
 
 class Display():
+    # Copy of the frame currently on the display, to find what changed in the next one.
+    last_frame: Optional[Image] = None
+    frames_presented: int = 0
+    frames_skipped: int = 0
+    partial_updates: int = 0
+
     def draw(self, img: Image) -> None:
-        pass
+        damage = self._get_damage(img)
+        if damage is None:
+            self.frames_skipped += 1
+            return
+
+        if damage != (0, 0, img.width, img.height):
+            self.partial_updates += 1
+        self.frames_presented += 1
+        self._present(img, damage)
+
+        if self.last_frame is None or self.last_frame.size != img.size:
+            self.last_frame = img.copy()
+        else:
+            self.last_frame.paste(img)
 
     def clear(self) -> None:
+        self.last_frame = None
+
+    def get_stats(self) -> DisplayStats:
+        return DisplayStats(
+            frames_presented=self.frames_presented,
+            frames_skipped=self.frames_skipped,
+            partial_updates=self.partial_updates,
+        )
+
+    # Pushes a frame to the display. Only the damaged area differs from the frame already shown.
+    def _present(self, img: Image, damage: Box) -> None:
         pass
 
+    def _get_damage(self, img: Image) -> Optional[Box]:
+        # Bounding box of the pixels that differ from the last frame, or None if nothing changed.
+        if self.last_frame is None or self.last_frame.size != img.size or self.last_frame.mode != img.mode:
+            return (0, 0, img.width, img.height)
+        return ImageChops.difference(self.last_frame, img).getbbox()
+
+
+class EmulatedCanvas:
+    image: Image
+
+    def __init__(self, width: int, height: int) -> None:
+        self.image = Image.new("RGB", (width, height))
+
+    def SetImage(self, img: Image, offset_x: int = 0, offset_y: int = 0, unsafe: bool = True) -> None:
+        self.image.paste(img, (offset_x, offset_y))
+
+    def Clear(self) -> None:
+        self.image.paste((0, 0, 0), (0, 0, self.image.width, self.image.height))
+
+
+class EmulatedMatrix(EmulatedCanvas):
+    # Stands in for RGBMatrix on machines without the HAT, following the same canvas API.
+    refresh_interval: float
+    last_vsync: float
+    swap_count: int
+
+    def __init__(self, width: int = GRID_WIDTH, height: int = GRID_HEIGHT, refresh_rate_hz: int = _REFRESH_RATE_HZ) -> None:
+        super().__init__(width, height)
+        self.refresh_interval = 1 / refresh_rate_hz
+        self.last_vsync = time.monotonic()
+        self.swap_count = 0
+
+    def CreateFrameCanvas(self) -> EmulatedCanvas:
+        return EmulatedCanvas(self.image.width, self.image.height)
+
+    def SwapOnVSync(self, canvas: EmulatedCanvas) -> EmulatedCanvas:
+        # Like the real matrix, block until the next refresh before showing the new canvas.
+        now = time.monotonic()
+        next_vsync = self.last_vsync + self.refresh_interval
+        if next_vsync > now:
+            time.sleep(next_vsync - now)
+            self.last_vsync = next_vsync
+        else:
+            self.last_vsync = now
+        self.swap_count += 1
+
+        # Returned canvas holds the previously displayed frame, as it does on the device.
+        previous = EmulatedCanvas(self.image.width, self.image.height)
+        previous.image = self.image
+        self.image = canvas.image
+        return previous
+
 
 class MatrixDisplay(Display):
-    matrix: RGBMatrix
+    matrix: Any
+    # Offscreen canvas that the next frame is written to, when double buffering.
+    canvas: Optional[Any]
+    # Area changed by the previous frame. The offscreen canvas still shows the frame before it,
+    # so that area needs rewriting along with the new damage.
+    canvas_damage: Optional[Box]
+
+    def __init__(self, double_buffered: bool = False, emulated: bool = False) -> None:
+        if emulated:
+            self.matrix = EmulatedMatrix()
+        else:
+            self.matrix = RGBMatrix(options=self._matrix_options())
 
-    def __init__(self) -> None:
+        self.canvas = None
+        self.canvas_damage = None
+        if double_buffered:
+            self.canvas = self.matrix.CreateFrameCanvas()
+        logging.info("Initialized %s matrix display (double buffered: %s)",
+                     "emulated" if emulated else "hardware", double_buffered)
+
+    def _matrix_options(self) -> Any:
         options = RGBMatrixOptions()
         options.rows = 32
         options.cols = 64
@@ -23,15 +148,43 @@ class MatrixDisplay(Display):
         options.pwm_bits = 11
         options.brightness = 40
         options.show_refresh_rate = False
-        options.limit_refresh_rate_hz = 120
+        options.limit_refresh_rate_hz = _REFRESH_RATE_HZ
         options.gpio_slowdown = 4
         # Sudo is needed to call ntpdate
         options.drop_privileges = False
         options.hardware_mapping = 'adafruit-hat-pwm'
-        self.matrix = RGBMatrix(options=options)
+        return options
 
-    def draw(self, img: Image) -> None:
-        self.matrix.SetImage(img, unsafe=False)
+    def _present(self, img: Image, damage: Box) -> None:
+        if self.canvas is None:
+            self._set_image(self.matrix, img, damage)
+            return
+
+        full_frame = (0, 0, img.width, img.height)
+        if self.canvas_damage is None:
+            # Contents of the offscreen canvas aren't known yet.
+            self.canvas_damage = full_frame
+        stale = _union(self.canvas_damage, damage)
+        self.canvas_damage = damage
+        self._set_image(self.canvas, img, stale)
+        self.canvas = self.matrix.SwapOnVSync(self.canvas)
+
+    def _set_image(self, canvas: Any, img: Image, box: Box) -> None:
+        # The unchecked fast path is only used for the offscreen canvas. Frames are always RGB images that fit it, and
+        # it isn't being shown while it's written. The matrix itself keeps the checked path it has always used.
+        unsafe = canvas is self.canvas
+        if box == (0, 0, img.width, img.height):
+            canvas.SetImage(img, unsafe=unsafe)
+        else:
+            canvas.SetImage(img.crop(box), box[0], box[1], unsafe=unsafe)
 
     def clear(self) -> None:
+        super().clear()
+        self.canvas_damage = None
         self.matrix.Clear()
+        if self.canvas is not None:
+            self.canvas.Clear()
+
+
+def _union(a: Box, b: Box) -> Box:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
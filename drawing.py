@@ -1,5 +1,7 @@
 import enum
+import functools
 import logging
+from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
 from PIL import Image, ImageDraw  # type: ignore
@@ -29,6 +31,36 @@ YELLOW = (255, 255, 0)
 ORANGE = (255, 220, 0)
 GRAY = (128, 128, 128)
 
+# Number of distinct strings whose layout is kept. Slides redraw a small, mostly fixed set of strings.
+_TEXT_RUN_CACHE_SIZE = 256
+
+
+@dataclass
+class TextRun:
+    # Width used to align the string, which may be wider than the mask if it was truncated.
+    width: int
+    # 1-bit image of all glyphs in the string, or None if no glyphs fit.
+    mask: Optional[Image]
+
+
+@dataclass(frozen=True)
+class Region:
+    # An offset area of a larger frame that a slide's output is placed into, clipped to its size.
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def origin(self) -> Tuple[int, int]:
+        return (self.x, self.y)
+
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+
+LEFT_HALF = Region(0, 0, int(GRID_WIDTH/2), GRID_HEIGHT)
+RIGHT_HALF = Region(int(GRID_WIDTH/2), 0, int(GRID_WIDTH/2), GRID_HEIGHT)
+
 
 def create_slide(type: SlideType) -> Image:
     if type == SlideType.FULL_WIDTH:
@@ -37,7 +69,44 @@ def create_slide(type: SlideType) -> Image:
         return Image.new("RGB", [int(GRID_WIDTH/2), GRID_HEIGHT])
 
 
+def paste_into_region(img: Image, region: Optional[Region], src: Image) -> None:
+    # Without a region, the source covers the whole image.
+    if region is None:
+        img.paste(src)
+        return
+    if src.size != region.size():
+        src = src.crop((0, 0, region.width, region.height))
+    img.paste(src, region.origin())
+
+
 def draw_string(img: ImageDraw, text: str, x: int, y: int, align: Align, set: GlyphSet, c: Color, max_width: Optional[int] = None) -> None:
+    text_run = _layout_text_run(text, set, max_width)
+
+    # Figure out where to start the letter drawing
+    originX = 0
+    if align == Align.LEFT:
+        originX = x
+    elif align == Align.RIGHT:
+        originX = x - text_run.width + 1
+    elif align == Align.CENTER:
+        originX = x - int(text_run.width / 2)
+
+    # The mask is colorless, so the same layout can be drawn in any color.
+    if text_run.mask is not None:
+        img.bitmap((originX, y), text_run.mask, fill=c)
+
+
+def get_string_width(text: str, set: GlyphSet) -> int:
+    return _layout_text_run(text, set, None).width
+
+
+def get_text_run_cache_info() -> functools._CacheInfo:
+    # Hit and miss counts for laid out strings, useful for sizing the cache.
+    return _layout_text_run.cache_info()
+
+
+@functools.lru_cache(maxsize=_TEXT_RUN_CACHE_SIZE)
+def _layout_text_run(text: str, set: GlyphSet, max_width: Optional[int]) -> TextRun:
     # Collect the glpyhs that make up the input text string.
     # Stop retrieving them if we exceed the max draw size.
     text_as_glyphs: List[Glyph] = []
@@ -54,27 +123,17 @@ def draw_string(img: ImageDraw, text: str, x: int, y: int, align: Align, set: Gl
     # Remove the kerning on the last letter
     text_glyph_width -= 1
 
-    # Figure out where to start the letter drawing
-    originX = 0
-    if align == Align.LEFT:
-        originX = x
-    elif align == Align.RIGHT:
-        originX = x - text_glyph_width + 1
-    elif align == Align.CENTER:
-        originX = x - int(text_glyph_width / 2)
+    if not text_as_glyphs:
+        return TextRun(width=text_glyph_width, mask=None)
 
+    mask_width = sum(glyph.width() + 1 for glyph in text_as_glyphs) - 1
+    mask_height = max(glyph.height() for glyph in text_as_glyphs)
+    mask = Image.new("1", (mask_width, mask_height))
     offsetX = 0
     for glyph in text_as_glyphs:
-        draw_glyph(img, glyph, originX+offsetX, y, c)
+        mask.paste(glyph.mask, (offsetX, 0))
         offsetX += glyph.width() + 1
-
-
-def get_string_width(text: str, set: GlyphSet) -> int:
-    width = 0
-    for i in range(0, len(text)):
-        glyph = ALL_GLYPHS[set, text[i]]
-        width += glyph.width() + 1
-    return width-1
+    return TextRun(width=text_glyph_width, mask=mask)
 
 
 def draw_glyph_by_name(img: ImageDraw, glyph_name: str, x: int, y: int, set: GlyphSet, c: Color) -> None:
@@ -85,10 +144,7 @@ def draw_glyph_by_name(img: ImageDraw, glyph_name: str, x: int, y: int, set: Gly
 
 
 def draw_glyph(img: ImageDraw, glyph: Glyph, x: int, y: int, c: Color) -> None:
-    for j, row in enumerate(glyph.layout):
-        for i, enabled in enumerate(row):
-            if enabled:
-                img.point((x+i, y+j), c)
+    img.bitmap((x, y), glyph.mask, fill=c)
 
 
 def draw_error(img: ImageDraw, title: str, message: str) -> None:
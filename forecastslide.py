@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Optional
 import requests
 from PIL import Image, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide, SlideType
+from abstractslide import VALID_INDEFINITELY, AbstractSlide, SlideType
 from deps import Dependencies
 from drawing import AQUA, GRAY, WHITE, Align, draw_glyph_by_name, draw_string
 from glyphs import GlyphSet
@@ -117,6 +117,14 @@ class ForecastSlide(AbstractSlide):
     def is_enabled(self) -> bool:
         return self._has_valid_data()
 
+    def get_cache_key(self) -> Any:
+        return (self._has_valid_data(), tuple(self.forecasts))
+
+    def get_valid_until(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        if not self._has_valid_data():
+            return VALID_INDEFINITELY
+        return self.last_forecast_retrieval + _FORECAST_STALENESS_THRESHOLD
+
     def draw(self, img: Image) -> None:
         if not self._has_valid_data():
             return
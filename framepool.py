@@ -0,0 +1,60 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List
+
+from PIL import Image  # type: ignore
+
+from abstractslide import SlideType
+from drawing import create_slide
+
+# Frames beyond this many per slide type are left for garbage collection when released.
+_DEFAULT_MAX_FREE = 4
+
+
+@dataclass
+class FramePoolStats:
+    frames_created: int
+    frames_reused: int
+
+
+class FramePool:
+    # Reuses frame images so the steady state draw loop doesn't allocate new ones.
+    # Frames can be released from a different thread than the one that acquired them.
+    max_free: int
+    free_frames: Dict[SlideType, List[Image]]
+    lock: threading.Lock
+
+    frames_created: int
+    frames_reused: int
+
+    def __init__(self, max_free: int = _DEFAULT_MAX_FREE) -> None:
+        self.max_free = max_free
+        self.free_frames = {type: [] for type in SlideType}
+        self.lock = threading.Lock()
+        self.frames_created = 0
+        self.frames_reused = 0
+
+    def acquire(self, type: SlideType) -> Image:
+        # Frames are always blank when acquired, as if newly created.
+        with self.lock:
+            free_frames = self.free_frames[type]
+            if not free_frames:
+                self.frames_created += 1
+                return create_slide(type)
+            self.frames_reused += 1
+            img = free_frames.pop()
+        img.paste((0, 0, 0), (0, 0, img.width, img.height))
+        return img
+
+    def release(self, type: SlideType, img: Image) -> None:
+        with self.lock:
+            free_frames = self.free_frames[type]
+            if len(free_frames) < self.max_free:
+                free_frames.append(img)
+
+    def get_stats(self) -> FramePoolStats:
+        with self.lock:
+            return FramePoolStats(
+                frames_created=self.frames_created,
+                frames_reused=self.frames_reused,
+            )
@@ -0,0 +1,91 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+from PIL import Image  # type: ignore
+
+_DEFAULT_MAX_DEPTH = 2
+
+
+@dataclass
+class FrameQueueStats:
+    depth: int
+    # Most frames the queue has held at once.
+    peak_depth: int
+    frames_queued: int
+    frames_taken: int
+    frames_dropped: int
+
+
+class FrameQueue:
+    # Hands rendered frames to the present stage. When full, the oldest frame is dropped
+    # so a slow display never delays rendering and always shows the newest frame.
+    max_depth: int
+    frames: Deque[Image]
+    condition: threading.Condition
+    closed: bool
+
+    peak_depth: int
+    frames_queued: int
+    frames_taken: int
+    frames_dropped: int
+
+    def __init__(self, max_depth: int = _DEFAULT_MAX_DEPTH) -> None:
+        if max_depth < 1:
+            raise ValueError("Frame queue must hold at least one frame.")
+        self.max_depth = max_depth
+        self.frames = deque()
+        self.condition = threading.Condition()
+        self.closed = False
+
+        self.peak_depth = 0
+        self.frames_queued = 0
+        self.frames_taken = 0
+        self.frames_dropped = 0
+
+    def put(self, img: Image) -> Optional[Image]:
+        # Returns the frame that was dropped to make room, if any.
+        dropped = None
+        with self.condition:
+            if len(self.frames) >= self.max_depth:
+                dropped = self.frames.popleft()
+                self.frames_dropped += 1
+            self.frames.append(img)
+            self.frames_queued += 1
+            self.peak_depth = max(self.peak_depth, len(self.frames))
+            self.condition.notify()
+        return dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Image]:
+        # Returns None if no frame arrived before the timeout, or the queue was closed.
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.frames or self.closed, timeout):
+                return None
+            if not self.frames:
+                return None
+            self.frames_taken += 1
+            return self.frames.popleft()
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def reopen(self) -> List[Image]:
+        # Returns the frames that were still queued, which are discarded.
+        with self.condition:
+            self.closed = False
+            discarded = list(self.frames)
+            self.frames.clear()
+            return discarded
+
+    def get_stats(self) -> FrameQueueStats:
+        with self.condition:
+            return FrameQueueStats(
+                depth=len(self.frames),
+                peak_depth=self.peak_depth,
+                frames_queued=self.frames_queued,
+                frames_taken=self.frames_taken,
+                frames_dropped=self.frames_dropped,
+            )
@@ -0,0 +1,131 @@
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional
+
+_DEFAULT_TARGET_FPS = 30
+_DEFAULT_IDLE_FPS = 2
+# Longest sleep between frames when the visible slides say their output won't change, in case the wall clock jumps.
+_DEFAULT_MAX_IDLE_SECONDS = 60
+# Number of recent frames used when computing statistics.
+_STATS_WINDOW = 600
+_STATS_LOG_INTERVAL_SECONDS = 60
+
+
+@dataclass
+class FrameStats:
+    frames: int
+    animating_frames: int
+    # Time spent rendering and presenting a frame, in seconds.
+    mean_frame_time: float
+    max_frame_time: float
+    # Time between the start of consecutive frames, in seconds.
+    mean_frame_interval: float
+    # Standard deviation of how late frames started relative to their schedule, in seconds.
+    jitter: float
+    max_lateness: float
+
+
+class FrameScheduler:
+    target_fps: float
+    idle_fps: float
+    max_idle_seconds: float
+
+    clock: Callable[[], float]
+    wake_event: threading.Event
+
+    frames: int
+    animating_frames: int
+    frame_start: Optional[float]
+    next_frame_time: Optional[float]
+    last_stats_log: float
+    frame_times: Deque[float]
+    frame_intervals: Deque[float]
+    lateness: Deque[float]
+
+    def __init__(self, target_fps: float = _DEFAULT_TARGET_FPS, idle_fps: float = _DEFAULT_IDLE_FPS, max_idle_seconds: float = _DEFAULT_MAX_IDLE_SECONDS, clock: Callable[[], float] = time.monotonic) -> None:
+        if target_fps <= 0 or idle_fps <= 0:
+            raise ValueError("Frame rates must be positive.")
+        self.target_fps = target_fps
+        # Idle rate should never be faster than the full rate.
+        self.idle_fps = min(idle_fps, target_fps)
+        self.max_idle_seconds = max(max_idle_seconds, 1 / self.idle_fps)
+        self.clock = clock
+        self.wake_event = threading.Event()
+
+        self.frames = 0
+        self.animating_frames = 0
+        self.frame_start = None
+        self.next_frame_time = None
+        self.last_stats_log = self.clock()
+        self.frame_times = deque(maxlen=_STATS_WINDOW)
+        self.frame_intervals = deque(maxlen=_STATS_WINDOW)
+        self.lateness = deque(maxlen=_STATS_WINDOW)
+
+    def start_frame(self) -> None:
+        now = self.clock()
+        if self.frame_start is not None:
+            self.frame_intervals.append(now - self.frame_start)
+        if self.next_frame_time is not None:
+            self.lateness.append(now - self.next_frame_time)
+        self.frame_start = now
+
+    # valid_for is how long after the start of the frame its output stays the same, if known.
+    def end_frame(self, animating: bool, valid_for: Optional[float] = None) -> None:
+        if self.frame_start is None:
+            raise AssertionError("end_frame called before start_frame")
+
+        now = self.clock()
+        self.frame_times.append(now - self.frame_start)
+        self.frames += 1
+        if animating:
+            self.animating_frames += 1
+
+        if now - self.last_stats_log >= _STATS_LOG_INTERVAL_SECONDS:
+            self.last_stats_log = now
+            logging.debug("Frame stats: %s", self.get_stats())
+
+        self.next_frame_time = self.frame_start + \
+            self._get_frame_interval(animating, valid_for)
+        delay = self.next_frame_time - now
+        if delay > 0:
+            self._sleep(delay)
+
+        # A frame requested early by wake() isn't late or early relative to any schedule.
+        if self.wake_event.is_set():
+            self.next_frame_time = None
+        self.wake_event.clear()
+
+    def _get_frame_interval(self, animating: bool, valid_for: Optional[float]) -> float:
+        if animating:
+            return 1 / self.target_fps
+        if valid_for is None:
+            return 1 / self.idle_fps
+        # Nothing needs drawing until the output changes, but never exceed the full rate.
+        return min(max(valid_for, 1 / self.target_fps), self.max_idle_seconds)
+
+    def wake(self) -> None:
+        # Cuts short the current sleep, e.g. when a transition starts or new data arrives while idle.
+        self.wake_event.set()
+
+    def get_stats(self) -> FrameStats:
+        frame_times = list(self.frame_times)
+        frame_intervals = list(self.frame_intervals)
+        lateness = list(self.lateness)
+        return FrameStats(
+            frames=self.frames,
+            animating_frames=self.animating_frames,
+            mean_frame_time=statistics.fmean(
+                frame_times) if frame_times else 0,
+            max_frame_time=max(frame_times, default=0),
+            mean_frame_interval=statistics.fmean(
+                frame_intervals) if frame_intervals else 0,
+            jitter=statistics.pstdev(lateness) if lateness else 0,
+            max_lateness=max(lateness, default=0),
+        )
+
+    def _sleep(self, delay: float) -> None:
+        self.wake_event.wait(delay)
@@ -1,9 +1,17 @@
 import enum
+import hashlib
+import os
 import re
-from collections import defaultdict
+import struct
+import threading
 from os import listdir, path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 import logging
+
+from PIL import Image  # type: ignore
+
+from startupprofile import STARTUP
+
 _SPACE_WIDTH = 3
 
 
@@ -17,22 +25,56 @@ _ALL_GLYPHS_TO_DIRECTORY = {
     GlyphSet.WEATHER: 'symbols/weather_onebit',
 }
 
+# Compiled glyph sets are stored here, one file per set, so the text files only need parsing when they change.
+_CACHE_DIRECTORY = 'symbols/__glyphcache__'
+_CACHE_MAGIC = b'LEDG'
+_CACHE_VERSION = 1
+# Magic, version, fingerprint of the source files, number of glyphs.
+_CACHE_HEADER = struct.Struct("<4sB20sI")
+# Length of the name, width, height. Followed by the name and the packed rows.
+_CACHE_GLYPH_HEADER = struct.Struct("<HBB")
+
 
 class Glyph:
     name: str
-    layout: List[List[bool]]
+    # Rows packed one bit per pixel, most significant bit first, each row padded to a whole byte.
+    # This matches the raw layout of 1-bit PIL images.
+    rows: bytes
+    # 1-bit image of the layout, so the glyph can be drawn with a single bitmap call.
+    mask: Image
 
     def __init__(self, name: str, data: List[str]):
         self.name = name
-        self.layout = []
+        width = len(data[0])
+        packed_rows = bytearray()
         for line in data:
-            self.layout.append([self._charToBool(c) for c in line])
+            bits = 0
+            for c in line:
+                bits = (bits << 1) | self._charToBool(c)
+            padding = (-width) % 8
+            packed_rows += (bits << padding).to_bytes((width + padding) // 8, "big")
+        self._set_rows(width, len(data), bytes(packed_rows))
+
+    @classmethod
+    def from_packed_rows(cls, name: str, width: int, height: int, rows: bytes) -> 'Glyph':
+        glyph = cls.__new__(cls)
+        glyph.name = name
+        glyph._set_rows(width, height, rows)
+        return glyph
+
+    def _set_rows(self, width: int, height: int, rows: bytes) -> None:
+        self.rows = rows
+        self.mask = Image.frombytes("1", (width, height), rows)
+
+    @property
+    def layout(self) -> List[List[bool]]:
+        return [[self.mask.getpixel((i, j)) != 0 for i in range(self.width())] for j in range(self.height())]
 
     def width(self) -> int:
-        return len(self.layout[0])
+        return self.mask.width
 
     def height(self) -> int:
-        return len(self.layout)
+        return self.mask.height
 
     def __str__(self) -> str:
         return "[%s] (%d x %d)" % (self.name, self.width(), self.height())
@@ -55,8 +97,24 @@ FALLBACK_GLYPH = Glyph("�", [
     "X.X.X.",
     ".X.X.X"
 ])
-ALL_GLYPHS: Dict[Tuple[GlyphSet, str],
-                Glyph] = defaultdict(lambda: FALLBACK_GLYPH)
+
+
+class _LazyGlyphs(Dict[Tuple[GlyphSet, str], Glyph]):
+    # Loads each glyph set the first time one of its glyphs is looked up.
+    # Glyphs that don't exist are drawn with the fallback glyph.
+
+    def __missing__(self, key: Tuple[GlyphSet, str]) -> Glyph:
+        # Another thread may have just loaded the set, so look again whether or not this call loaded it.
+        _load_glyph_set(key[0])
+        return self.get(key, FALLBACK_GLYPH)
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, tuple) and len(key) == 2 and isinstance(key[0], GlyphSet):
+            _load_glyph_set(key[0])
+        return super().__contains__(key)
+
+
+ALL_GLYPHS: Dict[Tuple[GlyphSet, str], Glyph] = _LazyGlyphs()
 
 # A space doesn't follow the file format well so add it here manually, in sets where it's relevant.
 SPACE_GLYPH = Glyph(" ", [
@@ -64,17 +122,20 @@ SPACE_GLYPH = Glyph(" ", [
 ])
 ALL_GLYPHS[GlyphSet.FONT_7PX, " "] = SPACE_GLYPH
 
+_loaded_sets: Set[GlyphSet] = set()
+_load_lock = threading.Lock()
+
 
-def _store_glyph(set: GlyphSet, name: str, data:List[str]) -> None:
+def _store_glyph(glyphs: Dict[str, Glyph], name: str, data: List[str]) -> None:
     # In case of two blank lines in a row, don't store anything.
     if name and len(data) > 0:
         # Don't accidentally read a data line as a glyph name.
-        if re.match("[\.X]{2,}", name):
+        if re.match(r"[\.X]{2,}", name):
             logging.warning("Suspicious glyph name: %s" % name)
-        glyph = Glyph(name, data)
-        ALL_GLYPHS[set, name] = glyph
+        glyphs[name] = Glyph(name, data)
 
-def _process_glyph_file(set: GlyphSet, filename: str) -> None:
+
+def _process_glyph_file(glyphs: Dict[str, Glyph], filename: str) -> None:
     found_name: str = ""
     found_data: List[str] = []
     with open(filename) as f:
@@ -82,7 +143,7 @@ def _process_glyph_file(set: GlyphSet, filename: str) -> None:
         for line in data:
             # If empty string, we finished reading a char.
             if not line:
-                _store_glyph(set, found_name, found_data)
+                _store_glyph(glyphs, found_name, found_data)
                 found_name = ""
                 found_data = []
 
@@ -93,21 +154,110 @@ def _process_glyph_file(set: GlyphSet, filename: str) -> None:
             # If we don't have a name yet, the first line specifies it.
             else:
                 found_name = line
-        
+
         # Store anything remaining at end of parsing file.
-        _store_glyph(set, found_name, found_data)
+        _store_glyph(glyphs, found_name, found_data)
+
+
+def _list_glyph_files(full_glyph_dir: str) -> List[str]:
+    filenames = []
+    for f in sorted(listdir(full_glyph_dir)):
+        full_filename = path.join(full_glyph_dir, f)
+        # Don't try to read things that aren't real files, or aren't .txt files
+        if path.isfile(full_filename) and re.match(r".*\.txt", f):
+            filenames.append(full_filename)
+    return filenames
+
+
+def _fingerprint(filenames: List[str]) -> bytes:
+    # Any edit to a source file changes its modification time or size, which invalidates the cache.
+    h = hashlib.sha1()
+    for filename in filenames:
+        stat = os.stat(filename)
+        h.update(("%s:%d:%d\n" % (path.basename(filename),
+                 stat.st_mtime_ns, stat.st_size)).encode())
+    return h.digest()
+
+
+def _read_cache(cache_filename: str, fingerprint: bytes) -> Dict[str, Glyph]:
+    glyphs: Dict[str, Glyph] = {}
+    with open(cache_filename, "rb") as f:
+        data = f.read()
+    magic, version, cached_fingerprint, count = _CACHE_HEADER.unpack_from(
+        data, 0)
+    if magic != _CACHE_MAGIC or version != _CACHE_VERSION or cached_fingerprint != fingerprint:
+        raise ValueError("Glyph cache %s is out of date" % cache_filename)
+    offset = _CACHE_HEADER.size
+    for _ in range(count):
+        name_length, width, height = _CACHE_GLYPH_HEADER.unpack_from(
+            data, offset)
+        offset += _CACHE_GLYPH_HEADER.size
+        name = data[offset:offset+name_length].decode("utf-8")
+        offset += name_length
+        rows_length = ((width + 7) // 8) * height
+        rows = data[offset:offset+rows_length]
+        offset += rows_length
+        glyphs[name] = Glyph.from_packed_rows(name, width, height, rows)
+    return glyphs
+
+
+def _write_cache(cache_filename: str, fingerprint: bytes, glyphs: Dict[str, Glyph]) -> None:
+    data = bytearray(_CACHE_HEADER.pack(
+        _CACHE_MAGIC, _CACHE_VERSION, fingerprint, len(glyphs)))
+    for name, glyph in glyphs.items():
+        encoded_name = name.encode("utf-8")
+        data += _CACHE_GLYPH_HEADER.pack(len(encoded_name),
+                                         glyph.width(), glyph.height())
+        data += encoded_name
+        data += glyph.rows
+    os.makedirs(path.dirname(cache_filename), exist_ok=True)
+    # Write to a temporary file first so a concurrent reader never sees a partial cache.
+    temp_filename = "%s.%d.tmp" % (cache_filename, os.getpid())
+    with open(temp_filename, "wb") as f:
+        f.write(data)
+    os.replace(temp_filename, cache_filename)
+
+
+def _load_glyph_set(set: GlyphSet) -> bool:
+    # Returns true if the set was loaded by this call.
+    if set in _loaded_sets:
+        return False
+    with _load_lock:
+        if set in _loaded_sets:
+            return False
+
+        start = STARTUP.start()
+        script_dir = path.dirname(path.realpath(__file__))
+        full_glyph_dir = path.join(script_dir, _ALL_GLYPHS_TO_DIRECTORY[set])
+        cache_filename = path.join(
+            script_dir, _CACHE_DIRECTORY, "%s.bin" % set.name.lower())
+        filenames = _list_glyph_files(full_glyph_dir)
+        fingerprint = _fingerprint(filenames)
 
+        try:
+            glyphs = _read_cache(cache_filename, fingerprint)
+            logging.debug("Loaded %d glyphs for %s from cache",
+                          len(glyphs), set)
+        except (OSError, ValueError, struct.error) as e:
+            logging.debug("Parsing glyphs for %s: %s", set, e)
+            glyphs = {}
+            for filename in filenames:
+                _process_glyph_file(glyphs, filename)
+            try:
+                _write_cache(cache_filename, fingerprint, glyphs)
+            except OSError as e:
+                # Glyphs still work without the cache, they are just slower to load.
+                logging.debug(
+                    "Failed writing glyph cache %s: %s", cache_filename, e)
 
-def _load_glyphs() -> None:
-    script_dir = path.dirname(path.realpath(__file__))
-    for set, glyph_subdir in _ALL_GLYPHS_TO_DIRECTORY.items():
-        full_glyph_dir = path.join(script_dir, glyph_subdir)
-        for f in listdir(full_glyph_dir):
-            full_filename = path.join(full_glyph_dir, f)
-            # Don't try to read things that aren't real files, or aren't .txt files
-            if path.isfile(full_filename) and re.match(".*\.txt", f):
-                _process_glyph_file(set, full_filename)
+        for name, glyph in glyphs.items():
+            ALL_GLYPHS[set, name] = glyph
+        _loaded_sets.add(set)
+        STARTUP.stop("load_glyphs:%s" % set.name, start)
+        return True
 
 
-# Run on startup outside of the main event flow.
-_load_glyphs()
+def load_all_glyphs() -> None:
+    # Glyph sets load lazily, this can be used to load them ahead of time instead.
+    for set in _ALL_GLYPHS_TO_DIRECTORY:
+        _load_glyph_set(set)
@@ -1,38 +1,60 @@
-from PIL import Image, ImageDraw  # type: ignore
-
-from drawing import Color
+import functools
 import logging
 
+from PIL import Image, ImageChops, ImageDraw  # type: ignore
+
 RENDER_SCALE = 10
 DOT_PADDING = 2
 MIN_BRIGHTNESS = 40
+RENDER_FORMATS = ["png", "webp"]
+
+# Forces rendering a gray dot if no color is being displayed.
+_BRIGHTNESS_FLOOR = [max(v, MIN_BRIGHTNESS) for v in range(256)] * 3
 
 
-def write_grid_to_file(name: str, base_img: Image) -> None:
-    base_width, base_height = base_img.size
-    width = (base_width * RENDER_SCALE) + DOT_PADDING
-    height = (base_height * RENDER_SCALE) + DOT_PADDING
-    img = Image.new('RGB', (width, height))
-    draw = ImageDraw.Draw(img)
-    for j in range(0, base_height):
-        for i in range(0, base_width):
-            pixel = base_img.getpixel((i, j))
-            x0 = (i * RENDER_SCALE) + DOT_PADDING
-            x1 = x0 + RENDER_SCALE - (DOT_PADDING * 2)
-            y0 = (j * RENDER_SCALE) + DOT_PADDING
-            y1 = y0 + RENDER_SCALE - (DOT_PADDING * 2)
-            draw.ellipse([x0, y0, x1, y1],
-                         fill=_brightness_floor(pixel))
-    filename = "render/" + name + ".png"
-    img.save(filename)
+def write_grid_to_file(name: str, base_img: Image, scale: int = RENDER_SCALE, padding: int = DOT_PADDING, format: str = "png") -> None:
+    if format not in RENDER_FORMATS:
+        raise ValueError("Unsupported render format %s" % format)
+    img = render_grid(base_img, scale, padding)
+    filename = "render/%s.%s" % (name, format)
+    if format == "webp":
+        # WebP is lossy by default, but renders should show exact colors.
+        img.save(filename, lossless=True)
+    else:
+        img.save(filename)
     logging.info("Saved render of %s to %s", name, filename)
 
 
-# Forces rendering a gray dot if no color is being displayed.
-def _brightness_floor(c: Color) -> Color:
-    def gt(a: int, b: int) -> int:
-        if a > b:
-            return a
-        else:
-            return b
-    return (gt(c[0], MIN_BRIGHTNESS), gt(c[1], MIN_BRIGHTNESS), gt(c[2], MIN_BRIGHTNESS))
+def render_grid(base_img: Image, scale: int = RENDER_SCALE, padding: int = DOT_PADDING) -> Image:
+    # Each LED becomes a dot in its own cell. Rather than drawing every dot, each pixel is scaled up
+    # to fill its cell and then multiplied by a grid of dots, which is white inside each dot and black elsewhere.
+    if scale < 1:
+        raise ValueError("Render scale must be at least 1, got %d" % scale)
+    # Small scales leave no room for the padding, so it shrinks to keep each dot at least a pixel wide.
+    padding = min(padding, (scale - 1) // 2)
+    base_width, base_height = base_img.size
+    colors = base_img.convert("RGB").point(_BRIGHTNESS_FLOOR).resize(
+        (base_width * scale, base_height * scale), Image.NEAREST)
+    dots = ImageChops.multiply(colors, _get_dot_grid(
+        base_width, base_height, scale, padding))
+
+    img = Image.new('RGB', ((base_width * scale) + padding,
+                    (base_height * scale) + padding))
+    img.paste(dots, (padding, padding))
+    return img
+
+
+@functools.lru_cache(maxsize=8)
+def _get_dot_grid(base_width: int, base_height: int, scale: int, padding: int) -> Image:
+    dot = Image.new('RGB', (scale, scale))
+    diameter = scale - (padding * 2)
+    ImageDraw.Draw(dot).ellipse([0, 0, diameter, diameter], fill=(255, 255, 255))
+
+    # Tile the dot across a row, then the row down the grid.
+    row = Image.new('RGB', (base_width * scale, scale))
+    for i in range(base_width):
+        row.paste(dot, (i * scale, 0))
+    grid = Image.new('RGB', (base_width * scale, base_height * scale))
+    for j in range(base_height):
+        grid.paste(row, (0, j * scale))
+    return grid
@@ -1,10 +1,10 @@
 import datetime
-from typing import Optional
+from typing import Any, Optional
 
 import requests
 from PIL import Image, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide, SlideType
+from abstractslide import VALID_INDEFINITELY, AbstractSlide, SlideType
 from deps import Dependencies
 from drawing import RED, Align, draw_string
 from glyphs import GlyphSet
@@ -47,6 +47,13 @@ class InternetStatusSlide(AbstractSlide):
     def get_type(self) -> SlideType:
         return SlideType.HALF_WIDTH
 
+    def get_cache_key(self) -> Any:
+        # Always draws the same message.
+        return ()
+
+    def get_valid_until(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        return VALID_INDEFINITELY
+
     def draw(self, img: Image) -> None:
         draw = ImageDraw.Draw(img)
         draw_string(draw, "NO", 32, 8, Align.CENTER, GlyphSet.FONT_7PX, RED)
@@ -1,38 +1,64 @@
 import argparse
+import gc
 import logging
 import subprocess
 import time
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from PIL import Image  # type: ignore
 
 from abstractslide import AbstractSlide
-from baseballslide import BaseballSlide
-from basketballslide import BasketballSlide
-from christmasslide import ChristmasSlide
-from config import SlideConfig, load_config
+from config import load_config
 from controller import Controller
 from deps import Dependencies
 from display import Display, MatrixDisplay
 from drawing import create_slide
-from forecastslide import ForecastSlide
-from imagewriter import write_grid_to_file
-from internetstatusslide import InternetStatusSlide
-from nycsubwayslide import NycSubwaySlide
+from imagewriter import RENDER_FORMATS, RENDER_SCALE, write_grid_to_file
 from show import Show
-from timeandtemperatureslide import TimeAndTemperatureSlide
+from slideregistry import create_slide_from_config
+from startupprofile import STARTUP
+
+# Longest to wait for the first response from every endpoint before generating images anyway.
+_GENERATE_IMAGES_TIMEOUT_SECONDS = 30
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1, got %s" % value)
+    return number
+
 
 parser = argparse.ArgumentParser(description='Run an LED Matrix show.')
 parser.add_argument('--generate_images', action='store_true',
                     help='Generates slide images instead of running interactively.')
+parser.add_argument('--render_scale', type=_positive_int, default=RENDER_SCALE,
+                    help='Size in pixels of each LED in generated images. Dot padding shrinks to fit small sizes.')
+parser.add_argument('--render_format', choices=RENDER_FORMATS, default='png',
+                    help='File format of generated images.')
 parser.add_argument('--debug_log', action='store_true',
                     help='Prints debug-level logging information.')
 parser.add_argument('--fake_display', action='store_true',
                     help='Uses a no-op display instead of expecting hardware.')
+parser.add_argument('--emulated_display', action='store_true',
+                    help='Uses an in-memory emulation of the matrix hardware, e.g. for benchmarking.')
+parser.add_argument('--benchmark_show', type=float, metavar='SECONDS',
+                    help='Runs the show for this long against recorded responses and a fake display, then reports throughput.')
+parser.add_argument('--profile_startup', type=str, nargs='?', const='startup_profile.json', metavar='PATH',
+                    help='Records how long each phase of startup takes, until the first split screen frame is shown, and writes the timeline as JSON.')
+parser.add_argument('--export_show', type=str, metavar='PATH',
+                    help='Records the show in simulated time, against recorded responses, to a .gif, animated .png or .y4m file.')
+parser.add_argument('--export_seconds', type=float, default=60,
+                    help='Length of show to record with --export_show, in simulated time.')
+parser.add_argument('--export_fps', type=int, default=30,
+                    help='Frames per second recorded by --export_show.')
 
 
 def main() -> None:
     args = parser.parse_args()
+    if args.profile_startup is not None:
+        STARTUP.enable(args.profile_startup)
 
     logging.basicConfig(
         format='%(asctime)s %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s',
@@ -42,71 +68,88 @@ def main() -> None:
         logging.getLogger().setLevel(logging.DEBUG)
 
     if args.generate_images:
-        generate_images()
+        generate_images(args.render_scale, args.render_format)
+    elif args.benchmark_show is not None:
+        # Imported here since the benchmark depends on test fixtures, which aren't needed otherwise.
+        from bench import bench_show
+        bench_show.run(args.benchmark_show, bench_show.parser.parse_args([]))
+    elif args.export_show is not None:
+        from bench import export_show
+        export_show.run(args.export_show, args.export_seconds,
+                        args.export_fps, args.render_scale)
     else:
-        run_show(args.fake_display)
+        run_show(args.fake_display, args.emulated_display)
 
 
-def generate_images() -> None:
+def generate_images(scale: int, format: str) -> None:
     config = load_config()
-    deps = Dependencies()
+    deps = Dependencies(config)
     static_slide = create_slide_from_config(config["static_slide"], deps)
     rotating_slides = [create_slide_from_config(
         slide_config, deps) for slide_config in config["rotating_slides"]]
     deps.get_requester().start()
-    sleep(5)
-    for slide in [static_slide, *rotating_slides]:
+    if not deps.get_requester().wait_until_ready(_GENERATE_IMAGES_TIMEOUT_SECONDS):
+        logging.warning(
+            "Not all requests finished in time, some slides may be missing data")
+
+    def generate_image(slide: AbstractSlide) -> None:
         img = create_slide(slide.get_type())
         name = type(slide).__name__
         if not slide.is_enabled():
             logging.warning("Slide %s was drawn but was not enabled", name)
         slide.draw(img)
-        write_grid_to_file(name, img)
+        write_grid_to_file(name, img, scale=scale, format=format)
+
+    # Encoding releases the GIL, so images are written in parallel.
+    with ThreadPoolExecutor() as executor:
+        for _ in executor.map(generate_image, [static_slide, *rotating_slides]):
+            pass
     deps.get_requester().stop()
 
 
-def run_show(fake_display: bool) -> None:
+def run_show(fake_display: bool, emulated_display: bool) -> None:
+    # Pillow reads PILLOW_BLOCKS_MAX when it's imported. Logged so the effect on frame times can be compared.
+    logging.info("Pillow keeps up to %d freed image blocks for reuse (PILLOW_BLOCKS_MAX)",
+                 Image.core.get_blocks_max())
+    start = STARTUP.start()
     config = load_config()
-    deps = Dependencies()
+    deps = Dependencies(config)
     static_slide = create_slide_from_config(config["static_slide"], deps)
     rotating_slides = [create_slide_from_config(
         slide_config, deps) for slide_config in config["rotating_slides"]]
-    display = Display() if fake_display else MatrixDisplay()
-    show = Show(config, display, deps.get_requester(),
+    STARTUP.stop("create_slides", start)
+
+    start = STARTUP.start()
+    display: Display
+    if fake_display:
+        display = Display()
+    else:
+        display = MatrixDisplay(double_buffered=config.get("double_buffered_display", False),
+                                emulated=emulated_display)
+    STARTUP.stop("create_display", start)
+
+    start = STARTUP.start()
+    show = Show(config, display, deps.get_requester(), deps.get_time_source(),
                 static_slide, rotating_slides)
+    STARTUP.stop("create_show", start)
 
     # Run startup tasks.
+    start = STARTUP.start()
     wait_for_network()
+    STARTUP.stop("wait_for_network", start)
+    start = STARTUP.start()
     sync_system_time()
+    STARTUP.stop("sync_system_time", start)
 
     # Signal the show it's ready to start, hand control to controller.
+    STARTUP.mark("startup_complete")
     show.startup_complete()
+    # Everything created during startup lives for the whole show, so keep it out of future garbage collections.
+    gc.freeze()
     controller = Controller(show)
     controller.run_until_shutdown()
 
 
-def create_slide_from_config(slide_config: SlideConfig, deps: Dependencies) -> AbstractSlide:
-    type = slide_config.get("type", "")
-    options = slide_config.get("options", {})
-
-    if type == "TimeAndTemperatureSlide":
-        return TimeAndTemperatureSlide(deps, options)
-    if type == "ForecastSlide":
-        return ForecastSlide(deps, options)
-    elif type == "ChristmasSlide":
-        return ChristmasSlide(deps)
-    elif type == "NycSubwaySlide":
-        return NycSubwaySlide(deps, options)
-    elif type == "InternetStatusSlide":
-        return InternetStatusSlide(deps)
-    elif type == "BaseballSlide":
-        return BaseballSlide(deps, options)
-    elif type == "BasketballSlide":
-        return BasketballSlide(deps, options)
-    else:
-        raise AssertionError("Unknown slide type %s", slide_config["type"])
-
-
 def wait_for_network() -> None:
     attempts = 1
     while True:
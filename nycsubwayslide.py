@@ -1,12 +1,12 @@
 import datetime
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 from dateutil import tz
 from PIL import Image, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide, SlideType
+from abstractslide import VALID_INDEFINITELY, AbstractSlide, SlideType
 from deps import Dependencies
 from drawing import (BLACK, GRAY, ORANGE, WHITE, YELLOW, Align, Color,
                      draw_string)
@@ -38,6 +38,7 @@ class NycSubwaySlide(AbstractSlide):
             refresh_interval=_REFRESH_INTERVAL,
             parse_callback=self._parse_q,
             error_callback=self._handle_error,
+            unchanged_callback=lambda: self._mark_updated("Q"),
             headers=headers,
         ))
         deps.get_requester().add_endpoint(Endpoint(
@@ -46,6 +47,7 @@ class NycSubwaySlide(AbstractSlide):
             refresh_interval=_REFRESH_INTERVAL,
             parse_callback=self._parse_b,
             error_callback=self._handle_error,
+            unchanged_callback=lambda: self._mark_updated("B", "FS"),
             headers=headers,
         ))
 
@@ -75,7 +77,13 @@ class NycSubwaySlide(AbstractSlide):
                         departures.append(t)
         # Departures aren't always given in order, so sort them before storing.
         self.departures[expected_line] = sorted(departures)
-        self.last_updated[expected_line] = self.time_source.now()
+        self._mark_updated(expected_line)
+        return True
+
+    def _mark_updated(self, *lines: str) -> bool:
+        # An unchanged feed still means the departures are current.
+        for line in lines:
+            self.last_updated[line] = self.time_source.now()
         return True
 
     def _handle_error(self, response: Optional[requests.models.Response]) -> None:
@@ -89,6 +97,29 @@ class NycSubwaySlide(AbstractSlide):
         # Slide should not be shown if there is no data at all.
         return self._get_num_lines() > 0
 
+    def get_cache_key(self) -> Any:
+        now = self.time_source.now()
+        # Departures are drawn in whole minutes, so compare the drawn strings rather than the time.
+        return tuple(self._get_departure_strings(line_key, now) if self._has_predictions(line_key) else None
+                     for line_key in ["Q", "B", "FS"])
+
+    def get_valid_until(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        valid_until = VALID_INDEFINITELY
+        # Parsing adds lines from the requester thread, so iterate over a snapshot. Each line's departures are
+        # replaced with a new list rather than changed in place, so the lists themselves are safe to read.
+        for line_key, departures in list(self.departures.items()):
+            last_updated = self.last_updated.get(line_key)
+            if last_updated is not None:
+                valid_until = min(
+                    valid_until, last_updated + _STALENESS_THRESHOLD)
+            # Each departure's minutes change as its time remaining passes the next whole minute.
+            for departure in departures:
+                diff = departure - now
+                if diff >= _DEPARTURE_LOWER_BOUND:
+                    valid_until = min(
+                        valid_until, now + diff % datetime.timedelta(minutes=1))
+        return valid_until
+
     def draw(self, img: Image) -> None:
         draw = ImageDraw.Draw(img)
         now = self.time_source.now()
@@ -125,13 +156,17 @@ class NycSubwaySlide(AbstractSlide):
         draw.ellipse([(0, y), (10, y+10)], fill=color)
         draw_string(draw, line_label + " ", 3, y+2,
                     Align.LEFT, GlyphSet.FONT_7PX, BLACK)
+        departure_strings = self._get_departure_strings(line_key, now)
+        draw_string(draw, (", ".join(departure_strings)) +
+                    " min", 14, y+2, Align.LEFT, GlyphSet.FONT_7PX, WHITE)
+
+    def _get_departure_strings(self, line_key: str, now: datetime.datetime) -> List[str]:
         departure_strings: List[str] = []
         for departure in self.departures[line_key]:
             diff = (departure - now)
             if diff >= _DEPARTURE_LOWER_BOUND and len(departure_strings) < _MAX_NUM_PREDICTIONS:
                 departure_strings.append("%d" % (diff.total_seconds() // 60))
-        draw_string(draw, (", ".join(departure_strings)) +
-                    " min", 14, y+2, Align.LEFT, GlyphSet.FONT_7PX, WHITE)
+        return departure_strings
 
     def _has_predictions(self, line_key: str) -> bool:
         now = self.time_source.now()
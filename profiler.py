@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List
+
+# Number of recent timings kept for each section.
+_DEFAULT_WINDOW = 1000
+
+
+@dataclass
+class SectionStats:
+    # Number of times the section ran since profiling was enabled.
+    count: int
+    # Latency over the most recent runs, in seconds.
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class Profiler:
+    # Times sections of the render path, e.g. drawing a particular slide or merging a transition.
+    # Call sites pair start() and stop(). When disabled, both return immediately.
+    enabled: bool
+    window: int
+    lock: threading.Lock
+    timings: Dict[str, Deque[float]]
+    counts: Dict[str, int]
+
+    def __init__(self, window: int = _DEFAULT_WINDOW) -> None:
+        self.enabled = False
+        self.window = window
+        self.lock = threading.Lock()
+        self.timings = {}
+        self.counts = {}
+
+    def start(self) -> float:
+        if not self.enabled:
+            return 0
+        return time.perf_counter()
+
+    def stop(self, section: str, subject: Any, start: float) -> None:
+        # Subject distinguishes instances of a section, e.g. the class of the slide being drawn.
+        if not self.enabled or not start:
+            return
+        elapsed = time.perf_counter() - start
+        name = "%s:%s" % (section, subject.__name__ if isinstance(
+            subject, type) else subject)
+        with self.lock:
+            if name not in self.timings:
+                self.timings[name] = deque(maxlen=self.window)
+                self.counts[name] = 0
+            self.timings[name].append(elapsed)
+            self.counts[name] += 1
+
+    def get_stats(self) -> Dict[str, SectionStats]:
+        with self.lock:
+            snapshot = {name: (self.counts[name], sorted(timings))
+                        for name, timings in self.timings.items()}
+        return {name: SectionStats(
+            count=count,
+            p50=_percentile(timings, 0.5),
+            p95=_percentile(timings, 0.95),
+            p99=_percentile(timings, 0.99),
+            max=timings[-1],
+        ) for name, (count, timings) in snapshot.items()}
+
+    def log_stats(self) -> None:
+        if not self.enabled:
+            return
+        for name, stats in sorted(self.get_stats().items()):
+            logging.debug("Render profile %s: count %d, p50 %.2fms, p95 %.2fms, p99 %.2fms, max %.2fms",
+                          name, stats.count, stats.p50 * 1000, stats.p95 * 1000, stats.p99 * 1000, stats.max * 1000)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.timings = {}
+            self.counts = {}
+
+
+def _percentile(sorted_timings: List[float], fraction: float) -> float:
+    # Nearest rank, so the result is always a real sample.
+    index = min(len(sorted_timings) - 1, int(fraction * len(sorted_timings)))
+    return sorted_timings[index]
+
+
+# Shared by everything in the render path, enabled by the show's configuration.
+PROFILER = Profiler()
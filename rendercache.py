@@ -0,0 +1,67 @@
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image  # type: ignore
+
+from abstractslide import AbstractSlide, SlideType
+from drawing import Region, create_slide, paste_into_region
+from profiler import PROFILER
+
+
+class RenderCache:
+    # Last rendered image for each slide, along with the cache key it was rendered at.
+    entries: Dict[AbstractSlide, Tuple[Any, Image]]
+    # Images reused for drawing uncacheable slides that are placed in a region.
+    scratch_images: Dict[SlideType, Image]
+    # Slideshow timers render ahead of the draw thread, and both share the entries and scratch images.
+    lock: Lock
+
+    def __init__(self) -> None:
+        self.entries = {}
+        self.scratch_images = {}
+        self.lock = Lock()
+
+    def draw(self, slide: AbstractSlide, img: Image, region: Optional[Region] = None) -> None:
+        with self.lock:
+            self._draw(slide, img, region)
+
+    def _draw(self, slide: AbstractSlide, img: Image, region: Optional[Region]) -> None:
+        key = slide.get_cache_key()
+        if key is None:
+            self._draw_uncached(slide, img, region)
+            return
+
+        entry = self.entries.get(slide)
+        if entry is not None and entry[0] == key:
+            paste_into_region(img, region, entry[1])
+            return
+
+        rendered_img = create_slide(slide.get_type())
+        self._draw_slide(slide, rendered_img)
+        # Data may have changed while drawing, in which case the render can't be trusted for this key.
+        if slide.get_cache_key() == key:
+            self.entries[slide] = (key, rendered_img)
+        paste_into_region(img, region, rendered_img)
+
+    def _draw_uncached(self, slide: AbstractSlide, img: Image, region: Optional[Region]) -> None:
+        if region is None:
+            self._draw_slide(slide, img)
+            return
+
+        # Slides can only draw into a whole image, so draw offscreen and then place it in the region.
+        type = slide.get_type()
+        if type not in self.scratch_images:
+            self.scratch_images[type] = create_slide(type)
+        scratch_img = self.scratch_images[type]
+        scratch_img.paste((0, 0, 0), (0, 0, scratch_img.width, scratch_img.height))
+        self._draw_slide(slide, scratch_img)
+        paste_into_region(img, region, scratch_img)
+
+    def _draw_slide(self, slide: AbstractSlide, img: Image) -> None:
+        start = PROFILER.start()
+        slide.draw(img)
+        PROFILER.stop("draw", type(slide), start)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries = {}
@@ -1,18 +1,24 @@
 import datetime
+import hashlib
 import logging
 import threading
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Protocol
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Protocol
+from urllib.parse import urlsplit
 
 import requests
-from croniter import croniter
+from requests.adapters import HTTPAdapter
 
+from startupprofile import STARTUP
 from timesource import TimeSource
 
 _LOG_REQUESTS = False
 
+# Most hosts serve one or two endpoints, so a few connections each is enough for their requests to overlap.
+DEFAULT_POOL_SIZE = 4
+
 
 class ParseCallback(Protocol):
     def __call__(self, response: requests.models.Response) -> bool:
@@ -29,6 +35,11 @@ class UrlCallback(Protocol):
         pass
 
 
+class UnchangedCallback(Protocol):
+    def __call__(self) -> bool:
+        pass
+
+
 @dataclass
 class Endpoint:
     name: str
@@ -39,6 +50,9 @@ class Endpoint:
     refresh_interval: Optional[datetime.timedelta] = None
     refresh_schedule: Optional[str] = None
     headers: Dict[str, str] = field(default_factory=dict)
+    # Called instead of parse_callback when the response is the same as the last one parsed, e.g. to note that the
+    # data is still current. Returns false if the last parse no longer applies, so the response is parsed again.
+    unchanged_callback: Optional[UnchangedCallback] = None
 
     def __post_init__(self):
         # Ensure that only one of url or url_callback is set.
@@ -58,6 +72,8 @@ class Endpoint:
 
         # If refresh_schedule is given, it must be a valid cron expression.
         if self.refresh_schedule is not None:
+            # Imported here since most endpoints refresh on an interval, and croniter is slow to import.
+            from croniter import croniter
             if not croniter.is_valid(self.refresh_schedule):
                 raise TypeError("Invalid refresh_schedule")
 
@@ -71,6 +87,9 @@ class Endpoint:
 
 
 class Requester(ABC):
+    # Called after an endpoint's parse or error callback runs, since either can change what slides draw.
+    on_update: Optional[Callable[[], None]] = None
+
     @abstractmethod
     def add_endpoint(self, endpoint: Endpoint) -> None:
         pass
@@ -83,67 +102,276 @@ class Requester(ABC):
     def stop(self) -> None:
         pass
 
+    # Waits until every endpoint has finished its first request, whether or not it succeeded.
+    # Returns false if that didn't happen within the timeout.
+    @abstractmethod
+    def wait_until_ready(self, timeout: float) -> bool:
+        pass
+
+
+@dataclass
+class ConnectionStats:
+    requests: int = 0
+    # Requests that needed a new connection, including its TLS handshake. The rest reused a kept-alive one.
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return self.requests - self.new_connections
+
+
+class SessionPool:
+    # One session per host, so connections are kept alive and reused by every endpoint on that host.
+    # Endpoints on the same host share its session from their own threads without locking. That relies on requests
+    # only making plain GETs with per-request headers here, so the session's settings are never changed after it's
+    # created. The remaining shared state is the urllib3 connection pool and the cookie jar, which both lock.
+    pool_size: int
+    lock: threading.Lock
+    sessions: Dict[str, requests.Session]
+    stats: Dict[str, ConnectionStats]
+    # Cleared if the connection count can't be read from urllib3, which stops connection stats being recorded.
+    count_connections: bool
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE) -> None:
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.stats = {}
+        self.count_connections = True
+
+    def get(self, url: str, headers: Dict[str, str]) -> requests.models.Response:
+        host = urlsplit(url).netloc
+        session = self._get_session(host)
+        if not self.count_connections:
+            return session.get(url, headers=headers)
+
+        # Counted around the request, so overlapping requests to the same host can be misattributed, but totals hold.
+        connections_before = _count_connections(session)
+        response = session.get(url, headers=headers)
+        connections_after = _count_connections(session)
+        if connections_before is None or connections_after is None:
+            logging.warning(
+                "Can't count connections with this version of urllib3, connection stats are disabled")
+            self.count_connections = False
+            return response
+        new_connection = connections_after > connections_before
+
+        with self.lock:
+            stats = self.stats.setdefault(host, ConnectionStats())
+            stats.requests += 1
+            if new_connection:
+                stats.new_connections += 1
+            logging.debug("Request to %s used a %s connection (%d of %d requests to the host reused one)", host,
+                          "new" if new_connection else "kept-alive", stats.reused_connections, stats.requests)
+        return response
+
+    def get_stats(self) -> Dict[str, ConnectionStats]:
+        with self.lock:
+            return {host: ConnectionStats(stats.requests, stats.new_connections)
+                    for host, stats in self.stats.items()}
+
+    def close(self) -> None:
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions = {}
+        for session in sessions:
+            session.close()
+
+    def _get_session(self, host: str) -> requests.Session:
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[host] = session
+            return self.sessions[host]
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    # Requests answered with 304 Not Modified, because the response hadn't changed since the last one.
+    not_modified: int = 0
+    bytes_received: int = 0
+    # Size of the last full response, each time a 304 meant it didn't need to be sent again.
+    bytes_saved: int = 0
+    # Responses handled by unchanged_callback instead of being parsed, after a 304 or an identical body.
+    parses_skipped: int = 0
+
+
+@dataclass
+class CachedResponse:
+    # What's known about the last successfully parsed response, so an unchanged one can be skipped.
+    url: str
+    # Validators, sent with the next request so the server can skip an unchanged body.
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int
+    # For servers without validators, an identical body is detected by its hash instead.
+    body_hash: bytes
+    # Parsed again after a 304 if there's no unchanged_callback, or it says the last parse no longer applies.
+    response: requests.models.Response
+
+    def get_conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _count_connections(session: requests.Session) -> Optional[int]:
+    # Connections opened so far by the session's connection pools. Both schemes share one adapter.
+    # These are urllib3 internals, so this returns None if they've changed rather than failing the request.
+    try:
+        pools = session.get_adapter("https://").poolmanager.pools
+        return sum(pool.num_connections for pool in (pools.get(key) for key in pools.keys()) if pool is not None)
+    except (AttributeError, TypeError):
+        return None
+
 
 class RequesterThread:
     endpoint: Endpoint
     time_source: TimeSource
+    sessions: SessionPool
+    on_update: Optional[Callable[[], None]]
+    # Set once the first request has been handled.
+    ready: threading.Event
     failures_without_success: int
+    cached_response: Optional[CachedResponse]
+    stats: EndpointStats
     timer: threading.Timer
 
-    def __init__(self, endpoint: Endpoint, time_source: TimeSource) -> None:
+    def __init__(self, endpoint: Endpoint, time_source: TimeSource, sessions: SessionPool, on_update: Optional[Callable[[], None]] = None) -> None:
         self.endpoint = endpoint
         self.time_source = time_source
+        self.sessions = sessions
+        self.on_update = on_update
+        self.ready = threading.Event()
         self.failures_without_success = 0
+        self.cached_response = None
+        self.stats = EndpointStats()
 
     def start(self) -> None:
         logging.debug("Starting requests to %s", self.endpoint.name)
-        self._request_with_retries()
+        # Make the first request in the background too, so endpoints are requested in parallel.
+        self.timer = threading.Timer(0, self._request_with_retries)
+        self.timer.start()
 
     def stop(self) -> None:
         if self.timer is not None:
             self.timer.cancel()
 
     def _request_with_retries(self) -> None:
+        start = STARTUP.start() if not self.ready.is_set() else 0
+        self._request()
+        STARTUP.stop("first_fetch:%s" % self.endpoint.name, start)
+        self.ready.set()
+        if self.on_update is not None:
+            self.on_update()
+
+    def _request(self) -> None:
         url = self.endpoint.get_url()
         # Missing URL may indicate that there is temporarily nothing to request.
         if url is None:
             self._schedule_next_request()
             return
 
+        # What's known about the last response only applies to its URL, and some endpoints' URLs change.
+        cached_response = self.cached_response
+        if cached_response is not None and cached_response.url != url:
+            cached_response = None
+        conditional_headers = cached_response.get_conditional_headers(
+        ) if cached_response is not None else {}
+
         try:
-            response = requests.get(url, headers=self.endpoint.headers)
+            response = self.sessions.get(
+                url, {**self.endpoint.headers, **conditional_headers})
         except Exception as e:
             self.failures_without_success += 1
+            self.cached_response = None
             self.endpoint.error_callback(None)
             logging.warning("Exception making request for endpoint %s (failures: %d). Url: %s, exception: %s",
                             self.endpoint.name, self.failures_without_success, url, e)
             self._schedule_retry()
             return
 
+        self.stats.requests += 1
+        if response.status_code == 304 and cached_response is not None and conditional_headers:
+            self._handle_not_modified(cached_response)
+            return
+
         self._log_to_file(response)
 
         if response.status_code >= 300:
             self.failures_without_success += 1
+            self.cached_response = None
             self.endpoint.error_callback(response)
             logging.warning("Non-2xx response %d from endpoint %s (failures: %d). Url: %s, response: %s",
                             response.status_code, self.endpoint.name, self.failures_without_success, url, response.content)
             self._schedule_retry()
             return
 
+        self.stats.bytes_received += len(response.content)
+        body_hash = hashlib.blake2b(response.content, digest_size=16).digest()
+        if cached_response is not None and cached_response.body_hash == body_hash:
+            parse_success = self._parse_unless_unchanged(response)
+        else:
+            parse_success = self._parse(
+                lambda: self.endpoint.parse_callback(response))
+        if parse_success:
+            self._cache_response(url, response, body_hash)
+
+    def _handle_not_modified(self, cached_response: CachedResponse) -> None:
+        self.stats.not_modified += 1
+        self.stats.bytes_saved += cached_response.size
+        logging.debug("Response from endpoint %s not modified, skipped %d bytes (%d skipped in total)",
+                      self.endpoint.name, cached_response.size, self.stats.bytes_saved)
+
+        self._parse_unless_unchanged(cached_response.response)
+
+    def _parse_unless_unchanged(self, response: requests.models.Response) -> bool:
+        # Either way counts as a successful fetch, so the endpoint's data is still treated as current.
+        unchanged_callback = self.endpoint.unchanged_callback
+
+        def parse() -> bool:
+            if unchanged_callback is not None and unchanged_callback():
+                self.stats.parses_skipped += 1
+                logging.debug("Skipped parsing unchanged response from endpoint %s (%d skipped in total)",
+                              self.endpoint.name, self.stats.parses_skipped)
+                return True
+            return self.endpoint.parse_callback(response)
+        return self._parse(parse)
+
+    def _parse(self, parse: Callable[[], bool]) -> bool:
+        # Returns whether parsing succeeded, after scheduling the next request accordingly.
         try:
-            parse_success = self.endpoint.parse_callback(response)
+            parse_success = parse()
         except Exception as e:
             self.failures_without_success += 1
+            self.cached_response = None
             logging.warning("Exception parsing response from endpoint %s (failures: %d). Exception: %s", self.endpoint.name, self.failures_without_success, e)
             self._schedule_retry()
-            return
+            return False
 
         if parse_success:
             self.failures_without_success = 0
             self._schedule_next_request()
         else:
             self.failures_without_success += 1
+            # Failures can reset what the slide holds, so the next response is parsed in full even if unchanged.
+            self.cached_response = None
             self._schedule_retry()
+        return parse_success
+
+    def _cache_response(self, url: str, response: requests.models.Response, body_hash: bytes) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        self.cached_response = CachedResponse(
+            url, etag, last_modified, len(response.content), body_hash, response)
 
     def _schedule_retry(self) -> None:
         if self.failures_without_success == 1:
@@ -163,6 +391,7 @@ class RequesterThread:
                 self.endpoint.refresh_interval.seconds, self._request_with_retries)
             self.timer.start()
         elif self.endpoint.refresh_schedule is not None:
+            from croniter import croniter
             next = croniter(self.endpoint.refresh_schedule,
                             self.time_source.now()).get_next(datetime.datetime)
             time_until_next = next - self.time_source.now()
@@ -185,11 +414,13 @@ class RequesterThread:
 
 class HttpRequester(Requester):
     time_source: TimeSource
+    sessions: SessionPool
     configured_endpoints: List[Endpoint]
     threads: List[RequesterThread]
 
-    def __init__(self, time_source: TimeSource) -> None:
+    def __init__(self, time_source: TimeSource, pool_size: int = DEFAULT_POOL_SIZE) -> None:
         self.time_source = time_source
+        self.sessions = SessionPool(pool_size)
         self.configured_endpoints = []
         self.threads = []
 
@@ -197,7 +428,7 @@ class HttpRequester(Requester):
         self.configured_endpoints.append(endpoint)
 
     def start(self) -> None:
-        self.threads = [RequesterThread(endpoint, self.time_source)
+        self.threads = [RequesterThread(endpoint, self.time_source, self.sessions, self.on_update)
                         for endpoint in self.configured_endpoints]
         for t in self.threads:
             t.start()
@@ -206,3 +437,17 @@ class HttpRequester(Requester):
         for t in self.threads:
             t.stop()
         self.threads = []
+        self.sessions.close()
+
+    def wait_until_ready(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        for t in self.threads:
+            if not t.ready.wait(max(0, deadline - time.monotonic())):
+                return False
+        return True
+
+    def get_connection_stats(self) -> Dict[str, ConnectionStats]:
+        return self.sessions.get_stats()
+
+    def get_endpoint_stats(self) -> Dict[str, EndpointStats]:
+        return {t.endpoint.name: replace(t.stats) for t in self.threads}
@@ -1,24 +1,43 @@
-
-from datetime import timedelta
+import logging
+import time
+from datetime import datetime, timedelta
 from threading import Thread
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from PIL import Image, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide, SlideType
+from abstractslide import VALID_INDEFINITELY, AbstractSlide, SlideType
+from clock import Clock, SystemClock
 from config import Config
-from constants import GRID_WIDTH
-from display import Display
-from drawing import AQUA, YELLOW, Align, create_slide, draw_string
+from display import Display, DisplayStats
+from drawing import AQUA, LEFT_HALF, RIGHT_HALF, YELLOW, Align, draw_string
+from framepool import FramePool, FramePoolStats
+from framequeue import FrameQueue, FrameQueueStats
+from framescheduler import FrameScheduler, FrameStats
 from glyphs import GlyphSet
+from profiler import PROFILER, SectionStats
+from rendercache import RenderCache
 from requester import Requester
 from slideshow import Slideshow
+from startupprofile import STARTUP
+from timesource import TimeSource
+from transitions import create_transition
+
+# How long the present stage waits for a frame before checking whether the show has stopped.
+_PRESENT_POLL_SECONDS = 0.5
+_PIPELINE_STATS_LOG_INTERVAL_SECONDS = 60
 
 
 class WelcomeSlide(AbstractSlide):
     def get_type(self) -> SlideType:
         return SlideType.FULL_WIDTH
 
+    def get_cache_key(self) -> Any:
+        return ()
+
+    def get_valid_until(self, now: datetime) -> Optional[datetime]:
+        return VALID_INDEFINITELY
+
     def draw(self, img: Image) -> None:
         draw = ImageDraw.Draw(img)
         draw_string(draw, "HELLO!", 64, 2, Align.CENTER,
@@ -30,52 +49,103 @@ class WelcomeSlide(AbstractSlide):
 class SplitScreenSlide(AbstractSlide):
     static_slide: AbstractSlide
     slideshow: Slideshow
+    render_cache: RenderCache
 
     def __init__(self, static_slide: AbstractSlide, slideshow: Slideshow) -> None:
         self.static_slide = static_slide
         self.slideshow = slideshow
+        self.render_cache = RenderCache()
 
     def get_type(self) -> SlideType:
         return SlideType.FULL_WIDTH
 
+    def get_cache_key(self) -> Any:
+        static_key = self.static_slide.get_cache_key()
+        slideshow_key = self.slideshow.get_cache_key()
+        if static_key is None or slideshow_key is None:
+            return None
+        return (static_key, slideshow_key)
+
+    def get_valid_until(self, now: datetime) -> Optional[datetime]:
+        static_valid_until = self.static_slide.get_valid_until(now)
+        slideshow_valid_until = self.slideshow.get_valid_until(now)
+        if static_valid_until is None or slideshow_valid_until is None:
+            return None
+        return min(static_valid_until, slideshow_valid_until)
+
     def draw(self, img: Image) -> None:
-        lhs = create_slide(SlideType.HALF_WIDTH)
-        self.static_slide.draw(lhs)
-        rhs = create_slide(SlideType.HALF_WIDTH)
-        self.slideshow.draw_frame(rhs)
-        img.paste(lhs)
-        img.paste(rhs, (int(GRID_WIDTH/2), 0))
+        start = PROFILER.start()
+        # Each half is placed straight into the frame, without intermediate images.
+        self.render_cache.draw(self.static_slide, img, LEFT_HALF)
+        self.slideshow.draw_frame(img, RIGHT_HALF)
+        PROFILER.stop("compose", SplitScreenSlide, start)
+
+    def is_animating(self) -> bool:
+        return self.static_slide.is_animating() or self.slideshow.is_animating()
 
 
 class Show:
     display: Display
     requester: Requester
+    time_source: TimeSource
     static_slide: AbstractSlide
 
     inner_slideshow: Slideshow
     split_screen_slide: SplitScreenSlide
     outer_slideshow: Slideshow
 
+    frame_scheduler: FrameScheduler
+    # Frames are returned here once presented, so the draw loop can reuse them.
+    frame_pool: FramePool
+    # Frames are rendered on the draw thread and pushed to the display on the present thread.
+    frame_queue: FrameQueue
+    # Without threads, frames are only drawn when draw_frame is called, e.g. when exporting in simulated time.
+    run_threads: bool
+    # First frame with data on both halves of the split screen, which ends the startup timeline once presented.
+    startup_frame: Optional[Image]
     draw_enabled: bool
     draw_thread: Thread
+    present_thread: Thread
 
-    def __init__(self, config: Config, display: Display, requester: Requester, static_slide: AbstractSlide, rotating_slides: List[AbstractSlide]) -> None:
+    def __init__(self, config: Config, display: Display, requester: Requester, time_source: TimeSource, static_slide: AbstractSlide, rotating_slides: List[AbstractSlide], clock: Optional[Clock] = None, run_threads: bool = True) -> None:
         self.display = display
         self.requester = requester
+        self.time_source = time_source
+        self.static_slide = static_slide
+        PROFILER.enabled = config.get("profile_rendering", False)
 
         inner_slide_advance = timedelta(
             seconds=config.get("slide_advance", 15))
         transition_interval = timedelta(
             milliseconds=config.get("transition_millis", 1000))
+        # Each slideshow gets its own transition, since a transition keeps the frames it blended.
+        transition_name = config.get("transition", "fade_to_black")
+        clock = clock if clock is not None else SystemClock()
         self.inner_slideshow = Slideshow(
-            rotating_slides, inner_slide_advance, transition_interval)
+            rotating_slides, inner_slide_advance, transition_interval, create_transition(transition_name), clock)
         self.split_screen_slide = SplitScreenSlide(
             static_slide, self.inner_slideshow)
 
         outer_slides = [WelcomeSlide(), self.split_screen_slide]
         self.outer_slideshow = Slideshow(
-            outer_slides, advance_interval=None, transition_interval=transition_interval)
+            outer_slides, advance_interval=None, transition_interval=transition_interval,
+            transition=create_transition(transition_name), clock=clock)
+
+        # Render at the full rate only while something is moving, otherwise just often enough to keep the clock current.
+        self.frame_scheduler = FrameScheduler(
+            target_fps=config.get("target_fps", 30),
+            idle_fps=config.get("idle_fps", 2),
+            max_idle_seconds=config.get("max_idle_seconds", 60))
+        # Transitions can start and data can arrive while the draw loop is idle, so don't wait for the next idle frame.
+        self.inner_slideshow.on_transition_start = self.frame_scheduler.wake
+        self.outer_slideshow.on_transition_start = self.frame_scheduler.wake
+        self.requester.on_update = self.frame_scheduler.wake
+        self.frame_queue = FrameQueue(config.get("frame_queue_depth", 2))
+        # Enough frames for a full queue, one being drawn and one being presented.
+        self.frame_pool = FramePool(max_free=self.frame_queue.max_depth + 2)
 
+        self.run_threads = run_threads
+        self.startup_frame = None
         self.draw_enabled = False
         self.start()
 
@@ -88,8 +158,14 @@ class Show:
         self.outer_slideshow.advance_to(0)
 
         self.draw_enabled = True
+        if not self.run_threads:
+            return
+        for discarded_img in self.frame_queue.reopen():
+            self.release_frame(discarded_img)
         self.draw_thread = Thread(target=self._draw_loop)
         self.draw_thread.start()
+        self.present_thread = Thread(target=self._present_loop)
+        self.present_thread.start()
 
     def startup_complete(self) -> None:
         self.requester.start()
@@ -98,21 +174,78 @@ class Show:
 
     def _draw_loop(self) -> None:
         while self.draw_enabled:
-            img = create_slide(SlideType.FULL_WIDTH)
-            self.outer_slideshow.draw_frame(img)
-            self.display.draw(img)
+            self.frame_scheduler.start_frame()
+            now = self.time_source.now()
+            img = self.draw_frame()
+            if STARTUP.enabled and self.startup_frame is None and self._is_split_screen_ready():
+                self.startup_frame = img
+            dropped_img = self.frame_queue.put(img)
+            if dropped_img is not None:
+                self.release_frame(dropped_img)
+            self.frame_scheduler.end_frame(
+                self.outer_slideshow.is_animating(), self._get_valid_for(now))
+
+    def draw_frame(self) -> Image:
+        # The frame should be passed to release_frame once it's no longer needed.
+        img = self.frame_pool.acquire(SlideType.FULL_WIDTH)
+        self.outer_slideshow.draw_frame(img)
+        return img
+
+    def _is_split_screen_ready(self) -> bool:
+        return (self.outer_slideshow.current_slide_id == 1 and not self.outer_slideshow.in_transition
+                and self.static_slide.is_enabled() and self.inner_slideshow.current_slide.is_enabled())
+
+    def release_frame(self, img: Image) -> None:
+        # Released frames are reused, so a later frame drawn into this one mustn't be taken for the startup frame.
+        if img is self.startup_frame:
+            self.startup_frame = None
+        self.frame_pool.release(SlideType.FULL_WIDTH, img)
+
+    def _get_valid_for(self, now: datetime) -> Optional[float]:
+        # Seconds from the start of the frame until its output can next change, if known.
+        valid_until = self.outer_slideshow.get_valid_until(now)
+        if valid_until is None:
+            return None
+        return (valid_until - now).total_seconds()
+
+    def _present_loop(self) -> None:
+        last_stats_log = time.monotonic()
+        while self.draw_enabled:
+            img = self.frame_queue.get(timeout=_PRESENT_POLL_SECONDS)
+            if img is not None:
+                start = PROFILER.start()
+                self.display.draw(img)
+                PROFILER.stop("display", type(self.display), start)
+                STARTUP.mark("first_frame_presented")
+                if img is self.startup_frame:
+                    STARTUP.finish("first_split_screen_frame_presented")
+                self.release_frame(img)
+
+            now = time.monotonic()
+            if now - last_stats_log >= _PIPELINE_STATS_LOG_INTERVAL_SECONDS:
+                last_stats_log = now
+                logging.debug("Frame queue stats: %s",
+                              self.frame_queue.get_stats())
+                logging.debug("Display stats: %s", self.display.get_stats())
+                PROFILER.log_stats()
 
     def stop(self) -> None:
         if not self.draw_enabled:
             return
 
         self.draw_enabled = False
+        # Still write the startup timeline if the show never got as far as a split screen frame.
+        STARTUP.finish("stopped_before_split_screen_frame")
         self.outer_slideshow.stop()
         self.inner_slideshow.stop()
         self.requester.stop()
 
-        # Change in draw_enabled should stop the draw thread.
-        self.draw_thread.join()
+        if self.run_threads:
+            # Change in draw_enabled should stop the draw and present threads.
+            self.frame_scheduler.wake()
+            self.frame_queue.close()
+            self.draw_thread.join()
+            self.present_thread.join()
         self.display.clear()
 
     def advance(self) -> None:
@@ -123,3 +256,18 @@ class Show:
 
     def unfreeze(self) -> None:
         self.inner_slideshow.unfreeze()
+
+    def get_frame_stats(self) -> FrameStats:
+        return self.frame_scheduler.get_stats()
+
+    def get_frame_queue_stats(self) -> FrameQueueStats:
+        return self.frame_queue.get_stats()
+
+    def get_frame_pool_stats(self) -> FramePoolStats:
+        return self.frame_pool.get_stats()
+
+    def get_display_stats(self) -> DisplayStats:
+        return self.display.get_stats()
+
+    def get_profile_stats(self) -> Dict[str, SectionStats]:
+        return PROFILER.get_stats()
@@ -0,0 +1,86 @@
+import importlib
+import logging
+import sys
+from dataclasses import dataclass
+from importlib.metadata import EntryPoint, entry_points
+from typing import Callable, Dict, Iterable, Optional
+
+from abstractslide import AbstractSlide
+from config import SlideConfig
+from deps import Dependencies
+
+# Third-party packages add slide types under this group. Each entry point is named after the slide type used in
+# config.json and loads the slide class, which is constructed with the dependencies and the slide's options.
+ENTRY_POINT_GROUP = "ledmatrix.slides"
+
+SlideFactory = Callable[[Dependencies, Dict[str, str]], AbstractSlide]
+
+
+@dataclass(frozen=True)
+class SlideSpec:
+    module: str
+    class_name: str
+    takes_options: bool = True
+
+
+# Built-in slides by type name. Modules are only imported once a config uses them, since some pull in heavy
+# dependencies like protobuf.
+_BUILT_IN_SLIDES: Dict[str, SlideSpec] = {
+    "TimeAndTemperatureSlide": SlideSpec("timeandtemperatureslide", "TimeAndTemperatureSlide"),
+    "ForecastSlide": SlideSpec("forecastslide", "ForecastSlide"),
+    "ChristmasSlide": SlideSpec("christmasslide", "ChristmasSlide", takes_options=False),
+    "NycSubwaySlide": SlideSpec("nycsubwayslide", "NycSubwaySlide"),
+    "InternetStatusSlide": SlideSpec("internetstatusslide", "InternetStatusSlide", takes_options=False),
+    "BaseballSlide": SlideSpec("baseballslide", "BaseballSlide"),
+    "BasketballSlide": SlideSpec("basketballslide", "BasketballSlide"),
+}
+
+_factories: Dict[str, SlideFactory] = {}
+
+
+def register_slide_type(type: str, factory: SlideFactory) -> None:
+    _factories[type] = factory
+
+
+def get_slide_factory(type: str) -> SlideFactory:
+    if type not in _factories:
+        factory = _load_built_in(type)
+        if factory is None:
+            factory = _load_entry_point(type)
+        if factory is None:
+            raise AssertionError("Unknown slide type %s" % type)
+        _factories[type] = factory
+    return _factories[type]
+
+
+def create_slide_from_config(slide_config: SlideConfig, deps: Dependencies) -> AbstractSlide:
+    type = slide_config.get("type", "")
+    options = slide_config.get("options", {})
+    return get_slide_factory(type)(deps, options)
+
+
+def _load_built_in(type: str) -> Optional[SlideFactory]:
+    spec = _BUILT_IN_SLIDES.get(type)
+    if spec is None:
+        return None
+    slide_class = getattr(importlib.import_module(spec.module), spec.class_name)
+    if spec.takes_options:
+        return slide_class
+    return lambda deps, _: slide_class(deps)
+
+
+def _load_entry_point(type: str) -> Optional[SlideFactory]:
+    # Reading installed package metadata is slow, so this only happens for types that aren't built in.
+    for entry_point in _slide_entry_points():
+        if entry_point.name == type:
+            logging.info("Loading slide type %s from %s",
+                         type, entry_point.value)
+            return entry_point.load()
+    return None
+
+
+def _slide_entry_points() -> Iterable[EntryPoint]:
+    if sys.version_info >= (3, 10):
+        return entry_points(group=ENTRY_POINT_GROUP)
+    # Before 3.10, entry points can't be selected by group and come back as a dict of every group instead.
+    return entry_points().get(ENTRY_POINT_GROUP, [])
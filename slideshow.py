@@ -1,53 +1,96 @@
 from datetime import datetime, timedelta
-from threading import Lock, Timer
-from typing import List, Optional
+from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple
 
-import requests
 from PIL import Image, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide, SlideType
-from constants import GRID_WIDTH
-from drawing import AQUA, YELLOW, Align, create_slide, draw_string
-from transitions import FadeToBlack
+from abstractslide import AbstractSlide
+from clock import Clock, SystemClock, TimerHandle
+from drawing import Region, create_slide, paste_into_region
+from profiler import PROFILER
+from rendercache import RenderCache
+from transitions import FadeToBlack, Transition
+
+# How long before an advance the incoming slide is rendered, so the transition doesn't have to.
+_PRERENDER_LEAD = timedelta(milliseconds=500)
 
 
 class Slideshow:
     advance_interval: Optional[timedelta]
     transition_interval: timedelta
+    transition: Transition
     slides: List[AbstractSlide]
+    # Source of transition timing and advance timers, which can be simulated to run faster than real time.
+    clock: Clock
 
     current_slide_id: int
     current_slide: AbstractSlide
     prev_slide: AbstractSlide
     is_running: bool
+    # Set by freeze(), which stops advances until unfreeze().
+    is_frozen: bool
     in_transition: bool
     transition_start_time: datetime
+    # Outgoing and incoming frames, rendered once when a transition starts.
+    prev_img: Optional[Image]
+    current_img: Optional[Image]
+    # Numbers each scheduled advance. Stopping or freezing also moves it on, so anything prepared before is stale.
+    advance_count: int
+    # Incoming slide rendered ahead of the next scheduled advance: the advance it was for, the slide ID and image.
+    prepared_slide: Optional[Tuple[int, int, Image]]
 
     slide_state_lock: Lock
-    advance_timer: Optional[Timer]
+    advance_timer: Optional[TimerHandle]
+    prepare_timer: Optional[TimerHandle]
+    on_transition_start: Optional[Callable[[], None]]
+    render_cache: RenderCache
 
-    def __init__(self, slides: List[AbstractSlide], advance_interval: Optional[timedelta], transition_interval: timedelta) -> None:
+    def __init__(self, slides: List[AbstractSlide], advance_interval: Optional[timedelta], transition_interval: timedelta, transition: Optional[Transition] = None, clock: Optional[Clock] = None) -> None:
         self.advance_interval = advance_interval
+        self.clock = clock if clock is not None else SystemClock()
         self.transition_interval = transition_interval
+        # Transitions keep the masks and frames they build, so the same one is reused for every frame.
+        self.transition = transition if transition is not None else FadeToBlack()
         self.slides = slides
 
         self.slide_state_lock = Lock()
         self.advance_timer = None
+        self.prepare_timer = None
         self.is_running = False
+        self.is_frozen = False
         self.in_transition = False
+        self.prev_img = None
+        self.current_img = None
+        self.advance_count = 0
+        self.prepared_slide = None
+        self.on_transition_start = None
+        self.render_cache = RenderCache()
 
     def start(self) -> None:
         if self.is_running:
             return
 
         self.is_running = True
+        self.is_frozen = False
         self.current_slide_id = 0
         self.current_slide = self.slides[0]
-        self._set_advance_timer()
+        self._set_advance_timer(self.advance_count)
+
+    def advance(self, advance_count: Optional[int] = None) -> None:
+        # Scheduled advances pass the advance count they were scheduled for. Stopping or freezing moves it on, so
+        # an advance they cancelled too late doesn't render, or schedule another once its render finishes.
+        self.slide_state_lock.acquire()
+        if advance_count is None:
+            advance_count = self.advance_count
+        is_current = advance_count == self.advance_count
+        self.slide_state_lock.release()
+        if not is_current:
+            return
 
-    def advance(self) -> None:
-        self._set_advance_timer()
+        self.advance_to(self._get_next_slide_id())
+        self._set_advance_timer(advance_count)
 
+    def _get_next_slide_id(self) -> int:
         next_slide_id = self.current_slide_id+1
         next_slide_id %= len(self.slides)
         while next_slide_id != self.current_slide_id:
@@ -55,62 +98,124 @@ class Slideshow:
                 break
             next_slide_id += 1
             next_slide_id %= len(self.slides)
-
-        self.advance_to(next_slide_id)
+        return next_slide_id
 
     def advance_to(self, next_slide_id: int) -> None:
         # No transition needed if we're only displaying one slide.
         if self.current_slide_id == next_slide_id:
             return
 
+        # Freeze both ends of the transition now, so transition frames only need to blend them.
+        prev_img = self._render_slide(self.current_slide)
+        self.slide_state_lock.acquire()
+        prepared_slide = self.prepared_slide
+        self.prepared_slide = None
+        advance_count = self.advance_count
+        self.slide_state_lock.release()
+        if prepared_slide is not None and prepared_slide[:2] == (advance_count, next_slide_id):
+            current_img = prepared_slide[2]
+        else:
+            current_img = self._render_slide(self.slides[next_slide_id])
+
         self.slide_state_lock.acquire()
 
         self.current_slide_id = next_slide_id
         self.prev_slide = self.current_slide
         self.current_slide = self.slides[self.current_slide_id]
+        self.prev_img = prev_img
+        self.current_img = current_img
         self.in_transition = True
-        self.transition_start_time = datetime.now()
+        self.transition_start_time = self.clock.now()
 
         self.slide_state_lock.release()
 
-    def _set_advance_timer(self) -> None:
+        if self.on_transition_start is not None:
+            self.on_transition_start()
+
+    def is_animating(self) -> bool:
+        return self.is_running and (self.in_transition or self.current_slide.is_animating())
+
+    def get_cache_key(self) -> Any:
+        if not self.is_running or self.in_transition:
+            return None
+        slide_key = self.current_slide.get_cache_key()
+        if slide_key is None:
+            return None
+        return (self.current_slide_id, slide_key)
+
+    def get_valid_until(self, now: datetime) -> Optional[datetime]:
+        # Advancing starts a transition, which wakes the show separately.
+        if not self.is_running or self.in_transition:
+            return None
+        return self.current_slide.get_valid_until(now)
+
+    def _set_advance_timer(self, advance_count: int) -> None:
         self.slide_state_lock.acquire()
+        if not self.is_running or self.is_frozen or advance_count != self.advance_count:
+            self.slide_state_lock.release()
+            return
+        self.advance_count += 1
+        self.prepared_slide = None
         # Schedule the next advance event, if applicable.
         if self.advance_interval is not None:
-            self.advance_timer = Timer(
-                self.advance_interval.seconds, self.advance)
-            self.advance_timer.start()
+            advance_count = self.advance_count
+            self.advance_timer = self.clock.call_later(
+                self.advance_interval.seconds, lambda: self.advance(advance_count))
+            self.prepare_timer = self.clock.call_later(
+                max(0, self.advance_interval.seconds - _PRERENDER_LEAD.total_seconds()),
+                lambda: self._prepare_next_slide(advance_count))
+        self.slide_state_lock.release()
+
+    def _prepare_next_slide(self, advance_count: int) -> None:
+        self.slide_state_lock.acquire()
+        next_slide_id = self._get_next_slide_id()
+        is_current = advance_count == self.advance_count and next_slide_id != self.current_slide_id
         self.slide_state_lock.release()
+        if not is_current:
+            return
+
+        # Rendering happens outside the lock so frames keep drawing. The render cache serialises it with them.
+        img = self._render_slide(self.slides[next_slide_id])
 
-    def draw_frame(self, img: ImageDraw) -> None:
+        # The advance may have happened, or the show stopped, while this was rendering.
+        self.slide_state_lock.acquire()
+        if advance_count == self.advance_count:
+            self.prepared_slide = (advance_count, next_slide_id, img)
+        self.slide_state_lock.release()
+
+    def _render_slide(self, slide: AbstractSlide) -> Image:
+        img = create_slide(slide.get_type())
+        self.render_cache.draw(slide, img)
+        return img
+
+    def draw_frame(self, img: ImageDraw, region: Optional[Region] = None) -> None:
         self.slide_state_lock.acquire()
         if self.in_transition:
-            self.draw_transition_frame(img)
+            self.draw_transition_frame(img, region)
         else:
-            self.draw_single_frame(img)
+            self.draw_single_frame(img, region)
         self.slide_state_lock.release()
 
-    def draw_single_frame(self, img: ImageDraw) -> None:
-        self.current_slide.draw(img)
+    def draw_single_frame(self, img: ImageDraw, region: Optional[Region] = None) -> None:
+        self.render_cache.draw(self.current_slide, img, region)
 
-    def draw_transition_frame(self, output_img: ImageDraw) -> None:
-        # This can be adjusted as more transitions are defined.
-        t = FadeToBlack()
-
-        elapsed_time = datetime.now() - self.transition_start_time
+    def draw_transition_frame(self, output_img: ImageDraw, region: Optional[Region] = None) -> None:
+        elapsed_time = self.clock.now() - self.transition_start_time
         progress = elapsed_time / self.transition_interval
-        if progress < 1:
-            prev_img = create_slide(self.prev_slide.get_type())
-            current_img = create_slide(self.current_slide.get_type())
-            self.prev_slide.draw(prev_img)
-            self.current_slide.draw(current_img)
-            merged_img = t.merge(progress, prev_img, current_img)
-            output_img.paste(merged_img)
+        if progress < 1 and self.prev_img is not None and self.current_img is not None:
+            start = PROFILER.start()
+            merged_img = self.transition.merge(
+                progress, self.prev_img, self.current_img)
+            PROFILER.stop("merge", type(self.transition), start)
+            paste_into_region(output_img, region, merged_img)
         else:
             # Transition is complete, just draw the current slide.
             # We need to call this now to avoid a flicker on this frame.
-            self.draw_single_frame(output_img)
+            self.draw_single_frame(output_img, region)
             self.in_transition = False
+            self.prev_img = None
+            self.current_img = None
+            self.transition.finish()
 
     def stop(self) -> None:
         if not self.is_running:
@@ -118,38 +223,33 @@ class Slideshow:
 
         self.is_running = False
         if self.advance_timer is not None:
-            self.slide_state_lock.acquire()
-            self.advance_timer.cancel()
-            self.advance_timer.join()
-            self.slide_state_lock.release()
+            self._cancel_timers()
 
     def freeze(self) -> None:
-        if self.is_running and self.advance_timer is not None and self.advance_timer.is_alive():
-            self.slide_state_lock.acquire()
-            self.advance_timer.cancel()
-            self.advance_timer.join()
-            self.slide_state_lock.release()
-
-    def unfreeze(self) -> None:
-        if self.is_running and self.advance_timer is not None and not self.advance_timer.is_alive():
-            self.advance()
-
+        if self.is_running and not self.is_frozen and self.advance_timer is not None:
+            self.is_frozen = True
+            self._cancel_timers()
 
-class SplitScreenSlide(AbstractSlide):
-    static_slide: AbstractSlide
-    slideshow: Slideshow
+    def _cancel_timers(self) -> None:
+        self.slide_state_lock.acquire()
+        advance_timer = self.advance_timer
+        if advance_timer is not None:
+            advance_timer.cancel()
+        if self.prepare_timer is not None:
+            # Not joined, since moving the advance count on below means a prepare that is already running throws
+            # its render away.
+            self.prepare_timer.cancel()
+        # Anything prepared ahead of time would be stale by the time the show resumes.
+        self.advance_count += 1
+        self.prepared_slide = None
+        self.slide_state_lock.release()
 
-    def __init__(self, static_slide: AbstractSlide, slideshow: Slideshow) -> None:
-        self.static_slide = static_slide
-        self.slideshow = slideshow
+        # Joined without the lock, since an advance that has already started renders and then takes it.
+        if advance_timer is not None:
+            advance_timer.join()
 
-    def slide_type(self) -> SlideType:
-        return SlideType.FULL_WIDTH
+    def unfreeze(self) -> None:
+        if self.is_running and self.is_frozen:
+            self.is_frozen = False
+            self.advance()
 
-    def draw(self, img: Image) -> None:
-        lhs = create_slide(SlideType.HALF_WIDTH)
-        self.static_slide.draw(lhs)
-        rhs = create_slide(SlideType.HALF_WIDTH)
-        self.slideshow.draw_frame(rhs)
-        img.paste(lhs)
-        img.paste(rhs, (int(GRID_WIDTH/2), 0))
@@ -0,0 +1,146 @@
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class TimelinePhase:
+    name: str
+    # Seconds since the process started.
+    start: float
+    end: float
+    duration: float
+    thread: str
+
+
+@dataclass
+class TimelineEvent:
+    name: str
+    # Seconds since the process started.
+    time: float
+    thread: str
+
+
+class StartupTimeline:
+    # Records how long each phase of startup took, until the show presents its first real frame.
+    # Call sites pair start() and stop() like the render profiler. When disabled, both return immediately.
+    enabled: bool
+    filename: Optional[str]
+    lock: threading.Lock
+    # Wall clock time the process started, and the matching perf_counter reading.
+    process_start_time: float
+    process_start_counter: float
+    # False if the process start time couldn't be read, so times are from when the timeline was enabled.
+    process_start_known: bool
+    phases: List[TimelinePhase]
+    events: List[TimelineEvent]
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.filename = None
+        self.lock = threading.Lock()
+        self.phases = []
+        self.events = []
+
+    def enable(self, filename: str) -> None:
+        now_counter = time.perf_counter()
+        process_age = _read_process_age()
+        self.process_start_known = process_age is not None
+        if process_age is None:
+            process_age = 0
+        self.process_start_time = time.time() - process_age
+        self.process_start_counter = now_counter - process_age
+        self.filename = filename
+        self.enabled = True
+        if self.process_start_known:
+            # Everything before main() runs: interpreter startup and module imports.
+            self._add_phase("interpreter_and_imports",
+                            self.process_start_counter, now_counter)
+
+    def start(self) -> float:
+        if not self.enabled:
+            return 0
+        return time.perf_counter()
+
+    def stop(self, phase: str, start: float) -> None:
+        if not self.enabled or not start:
+            return
+        self._add_phase(phase, start, time.perf_counter())
+
+    def mark(self, event: str) -> None:
+        # Only the first time each event happens is recorded.
+        if not self.enabled:
+            return
+        with self.lock:
+            self._add_event(event)
+
+    def finish(self, event: str) -> None:
+        # Marks the end of startup, then writes the report. Later calls do nothing.
+        # Threads can finish at the same time, so only the one that disables the timeline writes it.
+        with self.lock:
+            if not self.enabled:
+                return
+            self._add_event(event)
+            self.enabled = False
+        report = self.get_report()
+        if self.filename is not None:
+            with open(self.filename, "w") as f:
+                json.dump(report, f, indent=2)
+        logging.info("Startup took %.2fs. Timeline written to %s",
+                     report["total_seconds"], self.filename)
+        for phase in sorted(self.phases, key=lambda phase: phase.start):
+            logging.info("Startup phase %-40s %7.3fs - %7.3fs (%.3fs)",
+                         phase.name, phase.start, phase.end, phase.duration)
+
+    def get_report(self) -> Dict[str, Any]:
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase.start)
+            events = sorted(self.events, key=lambda event: event.time)
+        return {
+            "process_start": datetime.datetime.fromtimestamp(self.process_start_time).astimezone().isoformat(),
+            "process_start_known": self.process_start_known,
+            "total_seconds": events[-1].time if events else 0,
+            "phases": [asdict(phase) for phase in phases],
+            "events": [asdict(event) for event in events],
+        }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.enabled = False
+            self.filename = None
+            self.phases = []
+            self.events = []
+
+    def _add_event(self, event: str) -> None:
+        # Called with the lock held.
+        if any(existing.name == event for existing in self.events):
+            return
+        self.events.append(TimelineEvent(
+            event, time.perf_counter() - self.process_start_counter, threading.current_thread().name))
+
+    def _add_phase(self, phase: str, start: float, end: float) -> None:
+        with self.lock:
+            self.phases.append(TimelinePhase(phase, start - self.process_start_counter,
+                                             end - self.process_start_counter, end - start, threading.current_thread().name))
+
+
+def _read_process_age() -> Optional[float]:
+    # Linux only: seconds since the process started, from its start time in clock ticks since boot.
+    try:
+        with open("/proc/self/stat") as f:
+            # The command name can contain spaces, so fields are counted from after it.
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Shared by everything that runs during startup, enabled by --profile_startup.
+STARTUP = StartupTimeline()
@@ -0,0 +1,74 @@
+import argparse
+import glob
+import io
+import logging
+import os
+import sys
+import time
+import unittest
+from multiprocessing import Pool
+from typing import List, NamedTuple
+
+parser = argparse.ArgumentParser(
+    description='Runs the unit tests with each test module in its own worker process, and reports wall time.')
+parser.add_argument('modules', nargs='*',
+                    help='Test modules to run, e.g. test.test_drawing. Defaults to every module in test/.')
+parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                    help='Number of worker processes.')
+parser.add_argument('--slowest', type=int, default=5,
+                    help='Number of slowest modules to list.')
+
+
+class ModuleResult(NamedTuple):
+    module: str
+    tests_run: int
+    # Test IDs that failed or raised, with their tracebacks.
+    problems: List[str]
+    seconds: float
+
+
+def _run_module(module: str) -> ModuleResult:
+    # Slide tests log at debug level, which would interleave between workers. Failures are still reported.
+    logging.basicConfig(level=logging.CRITICAL)
+    start = time.perf_counter()
+    suite = unittest.defaultTestLoader.loadTestsFromName(module)
+    result = unittest.TextTestRunner(
+        stream=io.StringIO(), verbosity=0).run(suite)
+    problems = ["%s\n%s" % (test.id(), traceback)
+                for test, traceback in result.failures + result.errors]
+    return ModuleResult(module, result.testsRun, problems, time.perf_counter() - start)
+
+
+def _find_modules() -> List[str]:
+    test_dir = os.path.dirname(os.path.abspath(__file__))
+    return sorted("test." + os.path.splitext(os.path.basename(path))[0]
+                  for path in glob.glob(os.path.join(test_dir, "test_*.py")))
+
+
+def main() -> None:
+    args = parser.parse_args()
+    modules = args.modules or _find_modules()
+
+    start = time.perf_counter()
+    with Pool(max(1, args.workers)) as pool:
+        results = pool.map(_run_module, modules, chunksize=1)
+    wall_seconds = time.perf_counter() - start
+
+    problems = [problem for result in results for problem in result.problems]
+    for problem in problems:
+        print("=" * 70, file=sys.stderr)
+        print(problem, file=sys.stderr)
+
+    print("Slowest modules:")
+    for result in sorted(results, key=lambda result: result.seconds, reverse=True)[:args.slowest]:
+        print("  %6.2fs %s" % (result.seconds, result.module))
+    # Module time is summed across workers, so comparing it with wall time shows how much running in parallel saved.
+    print("Ran %d tests in %.2fs wall time (%.2fs across %d workers), %d failed" % (
+        sum(result.tests_run for result in results), wall_seconds,
+        sum(result.seconds for result in results), args.workers, len(problems)))
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
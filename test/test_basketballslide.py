@@ -139,3 +139,19 @@ class BasketballSlideTest(SlideTest):
         self.deps.get_requester().start()
 
         self.assertFalse(self.slide.is_enabled())
+
+    def test_unchanged_scoreboard_skipped_until_score_reset(self) -> None:
+        test_datetime = datetime.datetime(
+            2024, 4, 13, 16, 1, 0, 0, tz.gettz("America/New_York"))
+        self.deps.time_source.set(test_datetime)
+        self.deps.get_requester().expect(_SCHEDULE_URL,
+                                         "basketballslide_schedule_game_today.json")
+        self.deps.get_requester().expect(_SCOREBOARD_URL,
+                                         "basketballslide_scoreboard_game_in_progress.json")
+        self.deps.get_requester().start()
+        scoreboard_endpoint = self.deps.get_requester().configured_endpoints[1]
+
+        self.assertTrue(scoreboard_endpoint.unchanged_callback())
+
+        self.slide._handle_game_stats_error(None)
+        self.assertFalse(scoreboard_endpoint.unchanged_callback())
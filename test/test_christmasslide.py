@@ -43,3 +43,13 @@ class ChristmasSlideTest(SlideTest):
 
         slide = ChristmasSlide(self.deps)
         self.assertFalse(slide.is_enabled())
+
+    def test_valid_until_midnight(self) -> None:
+        test_datetime = datetime.datetime(
+            2022, 12, 22, 19, 31, tzinfo=tz.gettz("America/New_York"))
+        self.deps.time_source.set(test_datetime)
+
+        slide = ChristmasSlide(self.deps)
+
+        self.assertEqual(slide.get_valid_until(test_datetime), datetime.datetime(
+            2022, 12, 23, 0, 0, tzinfo=tz.gettz("America/New_York")))
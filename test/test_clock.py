@@ -0,0 +1,57 @@
+import datetime
+import unittest
+from typing import List
+
+from clock import SimulatedClock
+
+_START_TIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class SimulatedClockTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.clock = SimulatedClock(_START_TIME)
+        self.calls: List[str] = []
+
+    def test_timers_run_in_due_order(self) -> None:
+        self.clock.call_later(2, lambda: self.calls.append("second"))
+        self.clock.call_later(1, lambda: self.calls.append("first"))
+        self.clock.call_later(2, lambda: self.calls.append("third"))
+
+        self.clock.advance_to(_START_TIME + datetime.timedelta(seconds=1))
+        self.assertEqual(self.calls, ["first"])
+
+        self.clock.advance_to(_START_TIME + datetime.timedelta(seconds=5))
+        self.assertEqual(self.calls, ["first", "second", "third"])
+        self.assertEqual(self.clock.now(),
+                         _START_TIME + datetime.timedelta(seconds=5))
+
+    def test_timer_sees_its_due_time(self) -> None:
+        self.clock.call_later(
+            3, lambda: self.calls.append(self.clock.now().isoformat()))
+
+        self.clock.advance_to(_START_TIME + datetime.timedelta(seconds=10))
+
+        self.assertEqual(
+            self.calls, [(_START_TIME + datetime.timedelta(seconds=3)).isoformat()])
+
+    def test_timer_set_by_timer_runs_in_same_advance(self) -> None:
+        def reschedule() -> None:
+            self.calls.append("outer")
+            self.clock.call_later(1, lambda: self.calls.append("inner"))
+        self.clock.call_later(1, reschedule)
+
+        self.clock.advance_to(_START_TIME + datetime.timedelta(seconds=2))
+
+        self.assertEqual(self.calls, ["outer", "inner"])
+
+    def test_cancelled_timer_does_not_run(self) -> None:
+        timer = self.clock.call_later(1, lambda: self.calls.append("call"))
+        timer.cancel()
+
+        self.clock.advance_to(_START_TIME + datetime.timedelta(seconds=2))
+
+        self.assertEqual(self.calls, [])
+        self.assertFalse(timer.is_alive())
+
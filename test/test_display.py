@@ -0,0 +1,92 @@
+import unittest
+
+from PIL import ImageDraw  # type: ignore
+
+from abstractslide import SlideType
+from display import EmulatedMatrix, MatrixDisplay
+from drawing import RED, create_slide
+
+
+class MatrixDisplayTest(unittest.TestCase):
+
+    def test_double_buffered_swaps_canvas(self) -> None:
+        display = MatrixDisplay(double_buffered=True, emulated=True)
+        img = create_slide(SlideType.FULL_WIDTH)
+        ImageDraw.Draw(img).point((5, 5), RED)
+
+        display.draw(img)
+
+        matrix: EmulatedMatrix = display.matrix
+        self.assertEqual(matrix.swap_count, 1)
+        self.assertEqual(matrix.image.tobytes(), img.tobytes())
+        # The next frame is drawn to the canvas that was previously on screen.
+        self.assertIsNot(display.canvas.image, matrix.image)
+
+    def test_single_buffered_draws_directly(self) -> None:
+        display = MatrixDisplay(double_buffered=False, emulated=True)
+        img = create_slide(SlideType.FULL_WIDTH)
+        ImageDraw.Draw(img).point((5, 5), RED)
+
+        display.draw(img)
+
+        matrix: EmulatedMatrix = display.matrix
+        self.assertEqual(matrix.swap_count, 0)
+        self.assertEqual(matrix.image.tobytes(), img.tobytes())
+
+    def test_clear(self) -> None:
+        display = MatrixDisplay(double_buffered=True, emulated=True)
+        img = create_slide(SlideType.FULL_WIDTH)
+        ImageDraw.Draw(img).point((5, 5), RED)
+        display.draw(img)
+
+        display.clear()
+
+        matrix: EmulatedMatrix = display.matrix
+        self.assertIsNone(matrix.image.getbbox())
+
+    def test_skips_identical_frame(self) -> None:
+        display = MatrixDisplay(double_buffered=True, emulated=True)
+        img = create_slide(SlideType.FULL_WIDTH)
+        ImageDraw.Draw(img).point((5, 5), RED)
+
+        display.draw(img)
+        display.draw(img.copy())
+
+        matrix: EmulatedMatrix = display.matrix
+        self.assertEqual(matrix.swap_count, 1)
+        stats = display.get_stats()
+        self.assertEqual(stats.frames_presented, 1)
+        self.assertEqual(stats.frames_skipped, 1)
+
+    def test_double_buffered_partial_updates(self) -> None:
+        display = MatrixDisplay(double_buffered=True, emulated=True)
+        img = create_slide(SlideType.FULL_WIDTH)
+        display.draw(img)
+        display.draw(img)
+        frames = []
+        for x in range(3):
+            img = img.copy()
+            ImageDraw.Draw(img).point((x, x), RED)
+            frames.append(img)
+            display.draw(img)
+
+        # Each canvas catches up on the change it missed while the other one was on screen.
+        matrix: EmulatedMatrix = display.matrix
+        self.assertEqual(matrix.image.tobytes(), frames[-1].tobytes())
+        self.assertEqual(display.canvas.image.tobytes(), frames[-2].tobytes())
+        stats = display.get_stats()
+        self.assertEqual(stats.frames_skipped, 1)
+        self.assertEqual(stats.partial_updates, 3)
+
+    def test_draws_full_frame_after_clear(self) -> None:
+        display = MatrixDisplay(double_buffered=False, emulated=True)
+        img = create_slide(SlideType.FULL_WIDTH)
+        ImageDraw.Draw(img).point((5, 5), RED)
+        display.draw(img)
+        display.clear()
+
+        display.draw(img)
+
+        matrix: EmulatedMatrix = display.matrix
+        self.assertEqual(matrix.image.tobytes(), img.tobytes())
+        self.assertEqual(display.get_stats().frames_skipped, 0)
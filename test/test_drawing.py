@@ -0,0 +1,75 @@
+import unittest
+from typing import Set, Tuple
+
+from PIL import Image, ImageDraw  # type: ignore
+
+from abstractslide import SlideType
+from drawing import (RED, Align, create_slide, draw_glyph, draw_string,
+                     get_string_width, get_text_run_cache_info)
+from glyphs import Glyph, GlyphSet
+
+_TEST_GLYPH = Glyph("test", [
+    "XX.",
+    ".X.",
+    "X.X",
+])
+
+
+class DrawingTest(unittest.TestCase):
+
+    def test_string_width(self) -> None:
+        # Three 3px wide glyphs plus kerning between them.
+        self.assertEqual(get_string_width("   ", GlyphSet.FONT_7PX), 11)
+
+    def test_text_run_cache_hit(self) -> None:
+        img = create_slide(SlideType.HALF_WIDTH)
+        draw = ImageDraw.Draw(img)
+        draw_string(draw, "CACHE TEST", 0, 0, Align.LEFT,
+                    GlyphSet.FONT_7PX, RED)
+        before = get_text_run_cache_info()
+
+        # Same layout in another position and color should reuse the cached run.
+        draw_string(draw, "CACHE TEST", 0, 8, Align.LEFT,
+                    GlyphSet.FONT_7PX, (0, 0, 255))
+
+        after = get_text_run_cache_info()
+        self.assertEqual(after.hits, before.hits + 1)
+        self.assertEqual(after.misses, before.misses)
+        self.assertEqual(img.getpixel((0, 1)), RED)
+        self.assertEqual(img.getpixel((0, 9)), (0, 0, 255))
+
+    def test_truncated_string(self) -> None:
+        img = create_slide(SlideType.HALF_WIDTH)
+        draw_string(ImageDraw.Draw(img), "MMMMMMMMMMMMMMMMMMMMMMMMM", 0, 0, Align.LEFT,
+                    GlyphSet.FONT_7PX, RED, max_width=20)
+
+        bbox = img.getbbox()
+        self.assertIsNotNone(bbox)
+        self.assertLessEqual(bbox[2], 20)
+
+    def test_draw_glyph_at_offset(self) -> None:
+        img = Image.new("RGB", (6, 5), (0, 0, 255))
+        draw_glyph(ImageDraw.Draw(img), _TEST_GLYPH, 2, 1, RED)
+
+        self.assertEqual(self._lit_pixels(img), {(2, 1), (3, 1), (3, 2), (2, 3), (4, 3)})
+        # Pixels outside the glyph's mask keep the background.
+        self.assertEqual(img.getpixel((2, 2)), (0, 0, 255))
+
+    def test_draw_glyph_clipped_at_edge(self) -> None:
+        img = Image.new("RGB", (4, 3), (0, 0, 255))
+        draw = ImageDraw.Draw(img)
+        # Off the left edge, then off the top edge, so only part of each glyph lands in the image.
+        draw_glyph(draw, _TEST_GLYPH, -1, 1, RED)
+        draw_glyph(draw, _TEST_GLYPH, 2, -2, RED)
+
+        self.assertEqual(self._lit_pixels(img), {(0, 1), (0, 2), (2, 0)})
+
+    def _lit_pixels(self, img: Image) -> Set[Tuple[int, int]]:
+        lit = set()
+        for y in range(img.height):
+            for x in range(img.width):
+                pixel = img.getpixel((x, y))
+                if pixel != (0, 0, 255):
+                    self.assertEqual(pixel, RED)
+                    lit.add((x, y))
+        return lit
@@ -0,0 +1,92 @@
+import tracemalloc
+import unittest
+from datetime import timedelta
+from test.testing import CountingSlide
+
+from PIL import ImageDraw  # type: ignore
+
+from abstractslide import SlideType
+from display import Display
+from drawing import RED
+from framepool import FramePool
+from show import SplitScreenSlide
+from slideshow import Slideshow
+
+# Pixel data is allocated by Pillow outside of what tracemalloc sees, so this only catches
+# Python objects, such as a new Image being created each frame.
+_MAX_BYTES_PER_FRAME = 320
+
+
+class FramePoolTest(unittest.TestCase):
+
+    def test_reuses_released_frame(self) -> None:
+        pool = FramePool()
+        img = pool.acquire(SlideType.FULL_WIDTH)
+        pool.release(SlideType.FULL_WIDTH, img)
+
+        self.assertIs(pool.acquire(SlideType.FULL_WIDTH), img)
+        stats = pool.get_stats()
+        self.assertEqual(stats.frames_created, 1)
+        self.assertEqual(stats.frames_reused, 1)
+
+    def test_clears_on_acquire(self) -> None:
+        pool = FramePool()
+        img = pool.acquire(SlideType.HALF_WIDTH)
+        ImageDraw.Draw(img).point((5, 5), RED)
+        pool.release(SlideType.HALF_WIDTH, img)
+
+        self.assertIsNone(pool.acquire(SlideType.HALF_WIDTH).getbbox())
+
+    def test_keeps_frames_by_type(self) -> None:
+        pool = FramePool()
+        img = pool.acquire(SlideType.HALF_WIDTH)
+        pool.release(SlideType.HALF_WIDTH, img)
+
+        self.assertIsNot(pool.acquire(SlideType.FULL_WIDTH), img)
+
+    def test_limits_free_frames(self) -> None:
+        pool = FramePool(max_free=1)
+        pool.release(SlideType.FULL_WIDTH, pool.acquire(SlideType.FULL_WIDTH))
+        pool.release(SlideType.FULL_WIDTH, pool.acquire(SlideType.FULL_WIDTH))
+        imgs = [pool.acquire(SlideType.FULL_WIDTH) for _ in range(2)]
+        for img in imgs:
+            pool.release(SlideType.FULL_WIDTH, img)
+
+        self.assertEqual(len(pool.free_frames[SlideType.FULL_WIDTH]), 1)
+
+    def test_steady_state_frame_allocations(self) -> None:
+        inner_slideshow = Slideshow(
+            [CountingSlide(key=1)], None, timedelta(seconds=1))
+        outer_slideshow = Slideshow([SplitScreenSlide(
+            CountingSlide(key=2), inner_slideshow)], None, timedelta(seconds=1))
+        inner_slideshow.start()
+        outer_slideshow.start()
+        pool = FramePool()
+        display = Display()
+
+        # Same steps as the show's draw and present loops.
+        def draw_frame() -> None:
+            img = pool.acquire(SlideType.FULL_WIDTH)
+            outer_slideshow.draw_frame(img)
+            display.draw(img)
+            pool.release(SlideType.FULL_WIDTH, img)
+
+        for _ in range(10):
+            draw_frame()
+        tracemalloc.start()
+        try:
+            start_size, _ = tracemalloc.get_traced_memory()
+            max_frame_bytes = 0
+            for _ in range(100):
+                frame_start_size, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                draw_frame()
+                _, peak_size = tracemalloc.get_traced_memory()
+                max_frame_bytes = max(
+                    max_frame_bytes, peak_size - frame_start_size)
+            end_size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertLessEqual(max_frame_bytes, _MAX_BYTES_PER_FRAME)
+        self.assertLessEqual(end_size - start_size, _MAX_BYTES_PER_FRAME)
@@ -0,0 +1,52 @@
+import threading
+import unittest
+
+from abstractslide import SlideType
+from drawing import create_slide
+from framequeue import FrameQueue
+
+
+class FrameQueueTest(unittest.TestCase):
+
+    def test_drops_oldest_frame_when_full(self) -> None:
+        queue = FrameQueue(max_depth=2)
+        frames = [create_slide(SlideType.FULL_WIDTH) for _ in range(3)]
+
+        self.assertIsNone(queue.put(frames[0]))
+        self.assertIsNone(queue.put(frames[1]))
+        self.assertIs(queue.put(frames[2]), frames[0])
+
+        self.assertIs(queue.get(), frames[1])
+        self.assertIs(queue.get(), frames[2])
+        stats = queue.get_stats()
+        self.assertEqual(stats.depth, 0)
+        self.assertEqual(stats.peak_depth, 2)
+        self.assertEqual(stats.frames_queued, 3)
+        self.assertEqual(stats.frames_taken, 2)
+        self.assertEqual(stats.frames_dropped, 1)
+
+    def test_reopen_returns_queued_frames(self) -> None:
+        queue = FrameQueue()
+        img = create_slide(SlideType.FULL_WIDTH)
+        queue.put(img)
+        queue.close()
+
+        self.assertEqual(queue.reopen(), [img])
+        self.assertEqual(queue.get_stats().depth, 0)
+
+    def test_get_times_out(self) -> None:
+        queue = FrameQueue()
+        self.assertIsNone(queue.get(timeout=0.01))
+
+    def test_close_wakes_waiting_consumer(self) -> None:
+        queue = FrameQueue()
+        results = []
+        consumer = threading.Thread(
+            target=lambda: results.append(queue.get(timeout=10)))
+        consumer.start()
+
+        queue.close()
+        consumer.join(timeout=5)
+
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(results, [None])
@@ -0,0 +1,94 @@
+import unittest
+from typing import Optional
+
+from framescheduler import FrameScheduler
+
+
+class FakeClockFrameScheduler(FrameScheduler):
+    now: float
+    sleeps: list
+
+    def __init__(self, target_fps: float, idle_fps: float) -> None:
+        self.now = 0
+        self.sleeps = []
+        super().__init__(target_fps, idle_fps, max_idle_seconds=60, clock=lambda: self.now)
+
+    def _sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+class FrameSchedulerTest(unittest.TestCase):
+
+    def test_idle_rate_when_not_animating(self) -> None:
+        scheduler = FakeClockFrameScheduler(target_fps=50, idle_fps=2)
+
+        self._run_frame(scheduler, 0.1, animating=False)
+
+        # Frame took 100ms, next frame should start 500ms after the first.
+        self.assertAlmostEqual(scheduler.sleeps[0], 0.4)
+
+    def test_full_rate_when_animating(self) -> None:
+        scheduler = FakeClockFrameScheduler(target_fps=50, idle_fps=2)
+
+        self._run_frame(scheduler, 0.005, animating=True)
+
+        self.assertAlmostEqual(scheduler.sleeps[0], 0.015)
+
+    def test_sleeps_until_output_changes(self) -> None:
+        scheduler = FakeClockFrameScheduler(target_fps=50, idle_fps=2)
+
+        self._run_frame(scheduler, 0.01, animating=False, valid_for=30)
+
+        self.assertAlmostEqual(scheduler.sleeps[0], 29.99)
+
+    def test_sleep_until_output_changes_is_capped(self) -> None:
+        scheduler = FakeClockFrameScheduler(target_fps=50, idle_fps=2)
+
+        self._run_frame(scheduler, 0.01, animating=False, valid_for=3600)
+        self._run_frame(scheduler, 0.01, animating=False, valid_for=0)
+
+        self.assertAlmostEqual(scheduler.sleeps[0], 59.99)
+        # Output that's already changing is redrawn at no more than the full rate.
+        self.assertAlmostEqual(scheduler.sleeps[1], 0.01)
+
+    def test_ignores_valid_for_when_animating(self) -> None:
+        scheduler = FakeClockFrameScheduler(target_fps=50, idle_fps=2)
+
+        self._run_frame(scheduler, 0.005, animating=True, valid_for=30)
+
+        self.assertAlmostEqual(scheduler.sleeps[0], 0.015)
+
+    def test_no_sleep_when_frame_overruns(self) -> None:
+        scheduler = FakeClockFrameScheduler(target_fps=50, idle_fps=2)
+
+        self._run_frame(scheduler, 0.03, animating=True)
+        self._run_frame(scheduler, 0.01, animating=True)
+
+        self.assertEqual(len(scheduler.sleeps), 1)
+        stats = scheduler.get_stats()
+        self.assertAlmostEqual(stats.max_lateness, 0.01)
+        self.assertAlmostEqual(stats.max_frame_time, 0.03)
+
+    def test_stats(self) -> None:
+        scheduler = FakeClockFrameScheduler(target_fps=50, idle_fps=2)
+
+        for _ in range(10):
+            self._run_frame(scheduler, 0.01, animating=True)
+        self._run_frame(scheduler, 0.01, animating=False)
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats.frames, 11)
+        self.assertEqual(stats.animating_frames, 10)
+        self.assertAlmostEqual(stats.mean_frame_time, 0.01)
+        self.assertAlmostEqual(stats.mean_frame_interval, 0.02)
+        self.assertAlmostEqual(stats.jitter, 0)
+
+    def test_idle_rate_capped_at_target_rate(self) -> None:
+        scheduler = FrameScheduler(target_fps=10, idle_fps=20)
+        self.assertEqual(scheduler.idle_fps, 10)
+
+    def _run_frame(self, scheduler: FakeClockFrameScheduler, frame_time: float, animating: bool, valid_for: Optional[float] = None) -> None:
+        scheduler.start_frame()
+        scheduler.now += frame_time
+        scheduler.end_frame(animating, valid_for)
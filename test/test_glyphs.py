@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from glyphs import (ALL_GLYPHS, FALLBACK_GLYPH, Glyph, GlyphSet, _read_cache,
+                    _write_cache)
+
+
+class GlyphsTest(unittest.TestCase):
+
+    def test_packed_rows(self) -> None:
+        glyph = Glyph("test", [
+            "X........X",
+            ".X.......X",
+        ])
+
+        self.assertEqual(glyph.rows, bytes(
+            [0b10000000, 0b01000000, 0b01000000, 0b01000000]))
+        self.assertEqual(glyph.layout[1], [
+                         False, True, False, False, False, False, False, False, False, True])
+
+    def test_lazy_lookup(self) -> None:
+        self.assertIn((GlyphSet.WEATHER, "sun"), ALL_GLYPHS)
+        self.assertNotIn((GlyphSet.WEATHER, "not a glyph"), ALL_GLYPHS)
+        self.assertIs(ALL_GLYPHS[GlyphSet.FONT_7PX,
+                      "not a glyph"], FALLBACK_GLYPH)
+
+    def test_lookup_after_set_loaded_elsewhere(self) -> None:
+        # A lookup can miss while another thread finishes loading the set, and should still find the glyph.
+        sun = ALL_GLYPHS[GlyphSet.WEATHER, "sun"]
+
+        self.assertIs(ALL_GLYPHS.__missing__((GlyphSet.WEATHER, "sun")), sun)
+        self.assertIsNot(sun, FALLBACK_GLYPH)
+
+    def test_cache_round_trip(self) -> None:
+        glyphs = {
+            "A": ALL_GLYPHS[GlyphSet.FONT_7PX, "A"],
+            "sun": ALL_GLYPHS[GlyphSet.WEATHER, "sun"],
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_filename = os.path.join(temp_dir, "cache", "test.bin")
+            _write_cache(cache_filename, b"1" * 20, glyphs)
+
+            cached_glyphs = _read_cache(cache_filename, b"1" * 20)
+
+            self.assertEqual(cached_glyphs.keys(), glyphs.keys())
+            for name, glyph in glyphs.items():
+                self.assertEqual(cached_glyphs[name].layout, glyph.layout)
+
+    def test_cache_invalidated_by_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_filename = os.path.join(temp_dir, "test.bin")
+            _write_cache(cache_filename, b"1" * 20, {})
+
+            with self.assertRaises(ValueError):
+                _read_cache(cache_filename, b"2" * 20)
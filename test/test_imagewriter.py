@@ -0,0 +1,37 @@
+import unittest
+
+from PIL import Image  # type: ignore
+
+from drawing import RED
+from imagewriter import MIN_BRIGHTNESS, render_grid
+
+
+class ImageWriterTest(unittest.TestCase):
+
+    def test_renders_dot_per_pixel(self) -> None:
+        base_img = Image.new("RGB", (2, 1))
+        base_img.putpixel((0, 0), RED)
+
+        img = render_grid(base_img, scale=10, padding=2)
+
+        self.assertEqual(img.size, (22, 12))
+        # Center of each dot has the pixel's color, with off pixels drawn dim gray.
+        self.assertEqual(img.getpixel((5, 5)), (255, MIN_BRIGHTNESS, MIN_BRIGHTNESS))
+        self.assertEqual(img.getpixel((15, 5)), (MIN_BRIGHTNESS,) * 3)
+        # Padding and the corners of each cell stay black.
+        self.assertEqual(img.getpixel((0, 0)), (0, 0, 0))
+        self.assertEqual(img.getpixel((12, 2)), (0, 0, 0))
+        self.assertEqual(img.getpixel((21, 11)), (0, 0, 0))
+
+    def test_small_scale_shrinks_padding(self) -> None:
+        base_img = Image.new("RGB", (2, 1))
+        base_img.putpixel((0, 0), RED)
+
+        for scale in [1, 2, 3]:
+            img = render_grid(base_img, scale=scale, padding=2)
+
+            # Padding shrinks so each LED still gets a dot in its color.
+            padding = (scale - 1) // 2
+            center = padding + (scale - 2 * padding) // 2
+            self.assertEqual(img.size, (2 * scale + padding, scale + padding))
+            self.assertEqual(img.getpixel((center, center)), (255, MIN_BRIGHTNESS, MIN_BRIGHTNESS))
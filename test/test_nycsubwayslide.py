@@ -64,3 +64,32 @@ class NycSubwaySlideTest(SlideTest):
 
         self.assertTrue(self.slide.is_enabled())
         self.assertRenderMatchesGolden(self.slide)
+
+    def test_valid_until_departure_minutes_change(self) -> None:
+        self.deps.get_requester().expect_with_proto_response(
+            _NQRW_URL, "mta_nqrw.textproto", FeedMessage())
+        self.deps.get_requester().start()
+        now = self.deps.time_source.now() + datetime.timedelta(seconds=10)
+        self.deps.time_source.set(now)
+
+        valid_until = self.slide.get_valid_until(now)
+
+        self.assertGreater(valid_until, now)
+        self.assertLessEqual(valid_until, now + datetime.timedelta(minutes=1))
+        key = self.slide.get_cache_key()
+        self.deps.time_source.set(valid_until)
+        self.assertEqual(self.slide.get_cache_key(), key)
+        self.deps.time_source.set(valid_until + datetime.timedelta(seconds=1))
+        self.assertNotEqual(self.slide.get_cache_key(), key)
+
+    def test_unchanged_feed_keeps_departures_current(self) -> None:
+        self.deps.get_requester().expect_with_proto_response(
+            _NQRW_URL, "mta_nqrw.textproto", FeedMessage())
+        self.deps.get_requester().start()
+        later = self.deps.time_source.now() + datetime.timedelta(minutes=5)
+        self.deps.time_source.set(later)
+
+        nqrw_endpoint = self.deps.get_requester().configured_endpoints[0]
+        nqrw_endpoint.unchanged_callback()
+
+        self.assertEqual(self.slide.last_updated["Q"], later)
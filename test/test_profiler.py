@@ -0,0 +1,56 @@
+import unittest
+from collections import deque
+from test.testing import CountingSlide
+
+from abstractslide import SlideType
+from drawing import create_slide
+from profiler import Profiler, PROFILER
+from rendercache import RenderCache
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def test_records_nothing_when_disabled(self) -> None:
+        profiler = Profiler()
+
+        profiler.stop("draw", CountingSlide, profiler.start())
+
+        self.assertEqual(profiler.get_stats(), {})
+
+    def test_percentiles(self) -> None:
+        profiler = Profiler()
+        profiler.enabled = True
+        profiler.timings["draw:CountingSlide"] = deque(
+            i / 1000 for i in range(1, 101))
+        profiler.counts["draw:CountingSlide"] = 100
+
+        stats = profiler.get_stats()["draw:CountingSlide"]
+
+        self.assertEqual(stats.count, 100)
+        self.assertAlmostEqual(stats.p50, 0.051)
+        self.assertAlmostEqual(stats.p95, 0.096)
+        self.assertAlmostEqual(stats.p99, 0.1)
+        self.assertAlmostEqual(stats.max, 0.1)
+
+    def test_ring_buffer_keeps_recent_timings(self) -> None:
+        profiler = Profiler(window=10)
+        profiler.enabled = True
+
+        for _ in range(25):
+            profiler.stop("merge", "Wipe", profiler.start())
+
+        self.assertEqual(len(profiler.timings["merge:Wipe"]), 10)
+        self.assertEqual(profiler.get_stats()["merge:Wipe"].count, 25)
+
+    def test_times_slide_draws(self) -> None:
+        PROFILER.reset()
+        PROFILER.enabled = True
+        try:
+            slide = CountingSlide(key=None)
+            RenderCache().draw(slide, create_slide(SlideType.HALF_WIDTH))
+            stats = PROFILER.get_stats()
+        finally:
+            PROFILER.enabled = False
+            PROFILER.reset()
+
+        self.assertEqual(stats["draw:CountingSlide"].count, 1)
@@ -0,0 +1,70 @@
+import unittest
+from test.testing import CountingSlide
+
+from PIL import Image  # type: ignore
+
+from abstractslide import AbstractSlide, SlideType
+from drawing import RED, RIGHT_HALF, create_slide
+from rendercache import RenderCache
+
+
+class RenderCacheTest(unittest.TestCase):
+
+    def test_reuses_render_while_key_unchanged(self) -> None:
+        slide = CountingSlide(key=1)
+        cache = RenderCache()
+
+        first_img = self._draw(cache, slide)
+        second_img = self._draw(cache, slide)
+
+        self.assertEqual(slide.draw_count, 1)
+        self.assertEqual(first_img.tobytes(), second_img.tobytes())
+
+    def test_redraws_when_key_changes(self) -> None:
+        slide = CountingSlide(key=1)
+        cache = RenderCache()
+
+        self._draw(cache, slide)
+        slide.key = 2
+        img = self._draw(cache, slide)
+
+        self.assertEqual(slide.draw_count, 2)
+        self.assertEqual(img.getpixel((2, 0)), RED)
+
+    def test_always_draws_without_key(self) -> None:
+        slide = CountingSlide(key=None)
+        cache = RenderCache()
+
+        self._draw(cache, slide)
+        self._draw(cache, slide)
+
+        self.assertEqual(slide.draw_count, 2)
+
+    def test_draws_into_region(self) -> None:
+        slide = CountingSlide(key=1)
+        cache = RenderCache()
+        img = create_slide(SlideType.FULL_WIDTH)
+
+        cache.draw(slide, img, RIGHT_HALF)
+        cache.draw(slide, img, RIGHT_HALF)
+
+        self.assertEqual(slide.draw_count, 1)
+        self.assertEqual(img.getpixel((RIGHT_HALF.x + 1, 0)), RED)
+        self.assertEqual(img.getpixel((1, 0)), (0, 0, 0))
+
+    def test_draws_uncached_slide_into_region(self) -> None:
+        slide = CountingSlide(key=None)
+        cache = RenderCache()
+        img = create_slide(SlideType.FULL_WIDTH)
+
+        cache.draw(slide, img, RIGHT_HALF)
+        cache.draw(slide, img, RIGHT_HALF)
+
+        # The scratch image is cleared between draws, so only the latest point remains.
+        self.assertEqual(img.getpixel((RIGHT_HALF.x + 1, 0)), (0, 0, 0))
+        self.assertEqual(img.getpixel((RIGHT_HALF.x + 2, 0)), RED)
+
+    def _draw(self, cache: RenderCache, slide: AbstractSlide) -> Image:
+        img = create_slide(slide.get_type())
+        cache.draw(slide, img)
+        return img
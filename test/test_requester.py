@@ -0,0 +1,233 @@
+import datetime
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from test.testing import FakeTimeSource
+from typing import Callable, List, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+
+from requester import Endpoint, HttpRequester, RequesterThread, SessionPool
+
+
+class HttpRequesterTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.requester = HttpRequester(FakeTimeSource())
+        self.release_url = threading.Event()
+
+    def tearDown(self) -> None:
+        self.release_url.set()
+        self.requester.stop()
+
+    def test_ready_after_first_request(self) -> None:
+        self._add_endpoint()
+        self.requester.start()
+        self.assertFalse(self.requester.wait_until_ready(0))
+
+        self.release_url.set()
+
+        self.assertTrue(self.requester.wait_until_ready(5))
+
+    def test_requests_endpoints_in_parallel(self) -> None:
+        for _ in range(3):
+            self._add_endpoint()
+
+        # Starting doesn't wait for any endpoint.
+        self.requester.start()
+        self.release_url.set()
+
+        self.assertTrue(self.requester.wait_until_ready(5))
+
+    def _add_endpoint(self) -> None:
+        self.requester.add_endpoint(Endpoint(
+            name="test",
+            url_callback=self._url_callback,
+            refresh_interval=datetime.timedelta(hours=1),
+            parse_callback=self._parse,
+            error_callback=self._handle_error,
+        ))
+
+    def _url_callback(self) -> Optional[str]:
+        # Blocks the request until released. No URL means there is nothing to fetch.
+        self.release_url.wait(5)
+        return None
+
+    def _parse(self, response: requests.models.Response) -> bool:
+        return True
+
+    def _handle_error(self, response: Optional[requests.models.Response]) -> None:
+        pass
+
+
+_ETAG = '"v1"'
+_LAST_MODIFIED = "Sat, 13 Apr 2024 16:01:00 GMT"
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    # /etag and /last_modified send validators, and answer 304 when they come back.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path == "/etag" and self.headers.get("If-None-Match") == _ETAG:
+            self._send_not_modified()
+        elif self.path == "/last_modified" and self.headers.get("If-Modified-Since") == _LAST_MODIFIED:
+            self._send_not_modified()
+        else:
+            body = b"ok"
+            self.send_response(200)
+            if self.path == "/etag":
+                self.send_header("ETag", _ETAG)
+            elif self.path == "/last_modified":
+                self.send_header("Last-Modified", _LAST_MODIFIED)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def _send_not_modified(self) -> None:
+        self.send_response(304)
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class _NoPoolAdapter(BaseAdapter):
+    # Only mounted for https, which these tests never request, so it just has to close cleanly.
+    def send(self, *args: object, **kwargs: object) -> requests.models.Response:
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        pass
+
+
+class LocalServerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        # Registered first so they run last, and still run if closing the sessions fails.
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        threading.Thread(target=self.server.serve_forever,
+                         kwargs={"poll_interval": 0.01}).start()
+        self.host = "127.0.0.1:%d" % self.server.server_address[1]
+        self.sessions = SessionPool()
+
+    def tearDown(self) -> None:
+        self.sessions.close()
+
+
+class SessionPoolTest(LocalServerTest):
+
+    def test_reuses_connection_to_host(self) -> None:
+        for path in ["/a", "/b", "/a"]:
+            response = self.sessions.get(
+                "http://%s%s" % (self.host, path), {})
+            self.assertEqual(response.content, b"ok")
+
+        stats = self.sessions.get_stats()[self.host]
+        self.assertEqual(stats.requests, 3)
+        self.assertEqual(stats.new_connections, 1)
+        self.assertEqual(stats.reused_connections, 2)
+
+    def test_reconnects_after_close(self) -> None:
+        self.sessions.get("http://%s/a" % self.host, {})
+        self.sessions.close()
+        self.sessions.get("http://%s/a" % self.host, {})
+
+        self.assertEqual(
+            self.sessions.get_stats()[self.host].new_connections, 2)
+
+    def test_unreadable_connection_count_disables_stats(self) -> None:
+        # Connections are counted from the https adapter's urllib3 internals, which this adapter doesn't have.
+        self.sessions._get_session(self.host).mount("https://", _NoPoolAdapter())
+
+        response = self.sessions.get("http://%s/a" % self.host, {})
+
+        self.assertEqual(response.content, b"ok")
+        self.assertFalse(self.sessions.count_connections)
+        self.assertEqual(self.sessions.get_stats(), {})
+
+
+class ConditionalRequestTest(LocalServerTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.parsed: List[bytes] = []
+        self.parse_result = True
+        self.unchanged_count = 0
+
+    def test_unchanged_callback_replaces_parse(self) -> None:
+        thread = self._create_thread("/etag", unchanged_callback=self._unchanged)
+
+        self._request_twice(thread)
+
+        self.assertEqual(self.parsed, [b"ok"])
+        self.assertEqual(self.unchanged_count, 1)
+        self.assertEqual(thread.stats.not_modified, 1)
+        self.assertEqual(thread.stats.bytes_received, 2)
+        self.assertEqual(thread.stats.bytes_saved, 2)
+
+    def test_previous_response_parsed_without_unchanged_callback(self) -> None:
+        thread = self._create_thread("/last_modified")
+
+        self._request_twice(thread)
+
+        self.assertEqual(self.parsed, [b"ok", b"ok"])
+        self.assertEqual(thread.stats.not_modified, 1)
+        self.assertEqual(thread.failures_without_success, 0)
+
+    def test_identical_body_skips_parse(self) -> None:
+        thread = self._create_thread("/plain", unchanged_callback=self._unchanged)
+
+        self._request_twice(thread)
+
+        self.assertEqual(self.parsed, [b"ok"])
+        self.assertEqual(self.unchanged_count, 1)
+        self.assertEqual(thread.stats.not_modified, 0)
+        self.assertEqual(thread.stats.parses_skipped, 1)
+
+    def test_identical_body_parsed_without_unchanged_callback(self) -> None:
+        thread = self._create_thread("/plain")
+
+        self._request_twice(thread)
+
+        self.assertEqual(self.parsed, [b"ok", b"ok"])
+        self.assertEqual(thread.stats.parses_skipped, 0)
+
+    def test_identical_body_parsed_after_failure(self) -> None:
+        thread = self._create_thread("/plain", unchanged_callback=self._unchanged)
+        self.parse_result = False
+
+        self._request_twice(thread)
+
+        self.assertEqual(self.parsed, [b"ok", b"ok"])
+        self.assertEqual(self.unchanged_count, 0)
+
+    def _create_thread(self, path: str, unchanged_callback: Optional[Callable[[], bool]] = None) -> RequesterThread:
+        return RequesterThread(Endpoint(
+            name="test",
+            url="http://%s%s" % (self.host, path),
+            refresh_interval=datetime.timedelta(hours=1),
+            parse_callback=self._parse,
+            error_callback=self._handle_error,
+            unchanged_callback=unchanged_callback,
+        ), FakeTimeSource(), self.sessions)
+
+    def _request_twice(self, thread: RequesterThread) -> None:
+        # Each request schedules the next, which isn't wanted here.
+        for _ in range(2):
+            thread._request()
+            thread.stop()
+
+    def _parse(self, response: requests.models.Response) -> bool:
+        self.parsed.append(response.content)
+        return self.parse_result
+
+    def _unchanged(self) -> bool:
+        self.unchanged_count += 1
+        return True
+
+    def _handle_error(self, response: Optional[requests.models.Response]) -> None:
+        raise AssertionError("Unexpected error response")
@@ -0,0 +1,62 @@
+import datetime
+import subprocess
+import sys
+import unittest
+from test import testing
+
+from dateutil import tz
+
+import slideregistry
+from christmasslide import ChristmasSlide
+from slideregistry import (create_slide_from_config, get_slide_factory,
+                           register_slide_type)
+from timeandtemperatureslide import TimeAndTemperatureSlide
+
+
+class SlideRegistryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.deps = testing.TestDependencies()
+        self.deps.time_source.set(datetime.datetime(
+            2022, 12, 22, 19, 31, tzinfo=tz.gettz("America/New_York")))
+
+    def tearDown(self) -> None:
+        # Registered types are global, so they mustn't outlive the test that registered them.
+        slideregistry._factories.pop("CountingSlide", None)
+        super().tearDown()
+
+    def test_creates_built_in_slide_with_options(self) -> None:
+        slide = create_slide_from_config({"type": "TimeAndTemperatureSlide", "options": {
+            "weather_lat": "1.2345", "weather_lng": "-5.6789", "openweather_api_key": "OW-API-KEY"}}, self.deps)
+
+        self.assertIsInstance(slide, TimeAndTemperatureSlide)
+
+    def test_creates_built_in_slide_without_options(self) -> None:
+        slide = create_slide_from_config(
+            {"type": "ChristmasSlide", "options": {}}, self.deps)
+
+        self.assertIsInstance(slide, ChristmasSlide)
+
+    def test_registered_type(self) -> None:
+        register_slide_type("CountingSlide",
+                            lambda deps, options: testing.CountingSlide(options["key"]))
+
+        slide = create_slide_from_config(
+            {"type": "CountingSlide", "options": {"key": "abc"}}, self.deps)
+
+        self.assertIsInstance(slide, testing.CountingSlide)
+        self.assertEqual(slide.get_cache_key(), "abc")
+
+    def test_unknown_type(self) -> None:
+        with self.assertRaisesRegex(AssertionError, "Unknown slide type NotASlide"):
+            get_slide_factory("NotASlide")
+
+    def test_slide_modules_imported_on_demand(self) -> None:
+        # Run in a fresh interpreter, since other tests have already imported every slide.
+        code = ("import sys; from slideregistry import get_slide_factory; get_slide_factory('ForecastSlide'); "
+                "print(sorted(name for name in ['forecastslide', 'nycsubwayslide', 'gtfs_realtime_pb2'] if name in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code],
+                                capture_output=True, text=True, check=True).stdout
+
+        self.assertEqual(output.strip(), "['forecastslide']")
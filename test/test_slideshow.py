@@ -0,0 +1,135 @@
+import datetime
+import unittest
+from test.testing import CountingSlide
+from typing import Any, Callable, Optional
+
+from PIL import Image  # type: ignore
+
+from abstractslide import SlideType
+from clock import SimulatedClock
+from drawing import create_slide
+from slideshow import Slideshow
+
+
+class _InterruptedSlide(CountingSlide):
+    # Runs a callback from its first draw, as if it happened on another thread while the slide was rendering.
+    on_draw: Optional[Callable[[], None]]
+
+    def __init__(self, key: Any) -> None:
+        super().__init__(key)
+        self.on_draw = None
+
+    def draw(self, img: Image) -> None:
+        super().draw(img)
+        on_draw = self.on_draw
+        self.on_draw = None
+        if on_draw is not None:
+            on_draw()
+
+
+class SlideshowTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        # Slides without a cache key are redrawn whenever they are drawn.
+        self.slides = [CountingSlide(key=None), CountingSlide(key=None)]
+        self.slideshow = Slideshow(
+            self.slides, advance_interval=None, transition_interval=datetime.timedelta(hours=1))
+        self.slideshow.start()
+
+    def test_transition_draws_each_slide_once(self) -> None:
+        self.slideshow.advance_to(1)
+        for _ in range(10):
+            self.slideshow.draw_frame(create_slide(SlideType.HALF_WIDTH))
+
+        self.assertTrue(self.slideshow.in_transition)
+        self.assertEqual(self.slides[0].draw_count, 1)
+        self.assertEqual(self.slides[1].draw_count, 1)
+
+    def test_advance_uses_prepared_slide(self) -> None:
+        self.slideshow._prepare_next_slide(self.slideshow.advance_count)
+        self.assertEqual(self.slides[1].draw_count, 1)
+
+        self.slideshow.advance()
+
+        self.assertEqual(self.slideshow.current_slide_id, 1)
+        self.assertEqual(self.slides[1].draw_count, 1)
+
+    def test_prepare_for_earlier_advance_is_discarded(self) -> None:
+        stale_advance_count = self.slideshow.advance_count
+        self.slideshow.advance()
+
+        self.slideshow._prepare_next_slide(stale_advance_count)
+
+        self.assertIsNone(self.slideshow.prepared_slide)
+        self.assertEqual(self.slides[0].draw_count, 1)
+
+    def test_transition_complete(self) -> None:
+        self.slideshow.transition_interval = datetime.timedelta(microseconds=1)
+        self.slideshow.advance_to(1)
+
+        self.slideshow.draw_frame(create_slide(SlideType.HALF_WIDTH))
+
+        self.assertFalse(self.slideshow.in_transition)
+        self.assertIsNone(self.slideshow.prev_img)
+        self.assertEqual(self.slides[1].draw_count, 2)
+
+    def test_transition_complete_drops_blended_frames(self) -> None:
+        self.slideshow.advance_to(1)
+        self.slideshow.draw_frame(create_slide(SlideType.HALF_WIDTH))
+        self.assertIsNotNone(self.slideshow.transition.blended_frames)
+
+        self.slideshow.transition_interval = datetime.timedelta(microseconds=1)
+        self.slideshow.draw_frame(create_slide(SlideType.HALF_WIDTH))
+
+        self.assertIsNone(self.slideshow.transition.blended_frames)
+
+    def test_simulated_clock_advances_and_transitions(self) -> None:
+        start_time = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        clock = SimulatedClock(start_time)
+        slideshow = Slideshow(self.slides, advance_interval=datetime.timedelta(seconds=10),
+                              transition_interval=datetime.timedelta(seconds=1), clock=clock)
+        slideshow.start()
+
+        clock.advance_to(start_time + datetime.timedelta(seconds=10))
+        self.assertEqual(slideshow.current_slide_id, 1)
+        self.assertTrue(slideshow.in_transition)
+
+        clock.advance_to(start_time + datetime.timedelta(seconds=11))
+        slideshow.draw_frame(create_slide(SlideType.HALF_WIDTH))
+        self.assertFalse(slideshow.in_transition)
+        slideshow.stop()
+
+    def test_stop_during_advance_render(self) -> None:
+        slideshow, clock, start_time = self._start_interrupted_slideshow(
+            lambda slideshow: slideshow.stop())
+
+        clock.advance_to(start_time + datetime.timedelta(seconds=10))
+        self.assertFalse(slideshow.advance_timer.is_alive())
+        draw_counts = [slide.draw_count for slide in self.interrupted_slides]
+
+        clock.advance_to(start_time + datetime.timedelta(seconds=60))
+        self.assertEqual([slide.draw_count for slide in self.interrupted_slides], draw_counts)
+
+    def test_freeze_during_advance_render(self) -> None:
+        slideshow, clock, start_time = self._start_interrupted_slideshow(
+            lambda slideshow: slideshow.freeze())
+
+        clock.advance_to(start_time + datetime.timedelta(seconds=60))
+        self.assertEqual(slideshow.current_slide_id, 1)
+
+        slideshow.unfreeze()
+        self.assertEqual(slideshow.current_slide_id, 0)
+        self.assertTrue(slideshow.advance_timer.is_alive())
+        slideshow.stop()
+
+    def _start_interrupted_slideshow(self, on_draw: Callable[[Slideshow], None]) -> tuple:
+        start_time = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        clock = SimulatedClock(start_time)
+        self.interrupted_slides = [_InterruptedSlide(key=None), _InterruptedSlide(key=None)]
+        slideshow = Slideshow(self.interrupted_slides, advance_interval=datetime.timedelta(seconds=10),
+                              transition_interval=datetime.timedelta(seconds=1), clock=clock)
+        slideshow.start()
+        # The outgoing slide is rendered by the advance itself, after the incoming one was prepared.
+        self.interrupted_slides[0].on_draw = lambda: on_draw(slideshow)
+        return (slideshow, clock, start_time)
@@ -0,0 +1,95 @@
+import datetime
+import json
+import os
+import tempfile
+import time
+import unittest
+from test import testing
+
+from display import Display
+from show import Show
+from startupprofile import STARTUP, StartupTimeline
+
+
+class StartupTimelineTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.temp_dir.name, "startup.json")
+
+    def tearDown(self) -> None:
+        STARTUP.reset()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_records_nothing_when_disabled(self) -> None:
+        timeline = StartupTimeline()
+
+        timeline.stop("create_slides", timeline.start())
+        timeline.mark("startup_complete")
+
+        self.assertEqual(timeline.phases, [])
+        self.assertEqual(timeline.events, [])
+
+    def test_report(self) -> None:
+        timeline = StartupTimeline()
+        timeline.enable(self.filename)
+
+        timeline.stop("create_slides", timeline.start())
+        timeline.finish("done")
+
+        with open(self.filename) as f:
+            report = json.load(f)
+        phase_names = [phase["name"] for phase in report["phases"]]
+        self.assertEqual(phase_names[-1], "create_slides")
+        if report["process_start_known"]:
+            self.assertEqual(phase_names[0], "interpreter_and_imports")
+        self.assertEqual([event["name"]
+                         for event in report["events"]], ["done"])
+        self.assertGreaterEqual(
+            report["total_seconds"], report["phases"][-1]["end"])
+
+    def test_finish_only_reports_once(self) -> None:
+        timeline = StartupTimeline()
+        timeline.enable(self.filename)
+
+        timeline.finish("first")
+        timeline.finish("second")
+
+        self.assertFalse(timeline.enabled)
+        self.assertEqual([event.name for event in timeline.events], ["first"])
+
+    def test_show_finishes_at_first_split_screen_frame(self) -> None:
+        STARTUP.enable(self.filename)
+        deps = testing.TestDependencies()
+        deps.time_source.set(datetime.datetime(
+            2024, 1, 1, tzinfo=datetime.timezone.utc))
+        show = Show({"transition_millis": 1}, Display(), deps.requester, deps.time_source,  # type: ignore
+                    testing.CountingSlide(key=None), [testing.CountingSlide(key=None)])
+        try:
+            show.startup_complete()
+            deadline = time.monotonic() + 5
+            while STARTUP.enabled and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            show.stop()
+
+        with open(self.filename) as f:
+            report = json.load(f)
+        self.assertEqual([event["name"] for event in report["events"]],
+                         ["first_frame_presented", "first_split_screen_frame_presented"])
+
+    def test_released_frame_is_not_startup_frame(self) -> None:
+        STARTUP.enable(self.filename)
+        deps = testing.TestDependencies()
+        show = Show({}, Display(), deps.requester, deps.time_source,  # type: ignore
+                    testing.CountingSlide(key=None), [testing.CountingSlide(key=None)], run_threads=False)
+        img = show.draw_frame()
+        show.startup_frame = img
+
+        # A dropped frame goes back to the pool, and the next frame may be drawn into the same image.
+        show.release_frame(img)
+
+        self.assertIsNone(show.startup_frame)
+        show.stop()
@@ -62,3 +62,22 @@ class TimeAndTemperatureSlideTest(SlideTest):
         self.deps.time_source.set(test_datetime)
 
         self.assertRenderMatchesGolden(self.slide)
+
+    def test_valid_until_next_minute(self) -> None:
+        self.deps.get_requester().expect(_DEFAULT_OBSERVATIONS_URL,
+                                         "timeandtemperatureslide_current.json")
+        self.deps.get_requester().start()
+        test_datetime = self.test_datetime + datetime.timedelta(seconds=20)
+
+        self.assertEqual(self.slide.get_valid_until(test_datetime),
+                         self.test_datetime + datetime.timedelta(minutes=1))
+
+    def test_valid_until_observations_become_stale(self) -> None:
+        self.deps.get_requester().expect(_DEFAULT_OBSERVATIONS_URL,
+                                         "timeandtemperatureslide_current.json")
+        self.deps.get_requester().start()
+        test_datetime = self.test_datetime + \
+            datetime.timedelta(hours=2, minutes=59, seconds=30)
+
+        self.assertEqual(self.slide.get_valid_until(test_datetime),
+                         self.test_datetime + datetime.timedelta(hours=3))
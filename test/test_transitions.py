@@ -1,11 +1,22 @@
 from test.testing import SlideTest
 
-from PIL import Image, ImageDraw  # type: ignore
+from PIL import Image, ImageDraw, ImageEnhance  # type: ignore
 
 from abstractslide import SlideType
 from drawing import GREEN, RED, Align, create_slide, draw_string
 from glyphs import GlyphSet
-from transitions import FadeToBlack
+from transitions import (Crossfade, FadeToBlack, Slide, Transition, Wipe,
+                         create_transition)
+
+
+def _draw_test_images() -> tuple:
+    img0 = create_slide(SlideType.HALF_WIDTH)
+    draw_string(ImageDraw.Draw(img0), "A" * 22, 0, 0,
+                Align.LEFT, GlyphSet.FONT_7PX, RED)
+    img1 = create_slide(SlideType.HALF_WIDTH)
+    draw_string(ImageDraw.Draw(img1), "B" * 22, 0, 24,
+                Align.LEFT, GlyphSet.FONT_7PX, GREEN)
+    return (img0, img1)
 
 
 class FadeToBlackTransitionTest(SlideTest):
@@ -30,13 +41,80 @@ class FadeToBlackTransitionTest(SlideTest):
         actual_img = self._test_fade_to_black_at(1.0)
         self.assertImageMatchesGolden(actual_img)
 
-    def _test_fade_to_black_at(self, progress: float) -> Image:
-        img0 = create_slide(SlideType.HALF_WIDTH)
-        draw_string(ImageDraw.Draw(img0), "A" * 22, 0, 0,
-                    Align.LEFT, GlyphSet.FONT_7PX, RED)
-        img1 = create_slide(SlideType.HALF_WIDTH)
-        draw_string(ImageDraw.Draw(img1), "B" * 22, 0, 24,
-                    Align.LEFT, GlyphSet.FONT_7PX, GREEN)
+    def test_matches_brightness_enhance_at_every_step(self) -> None:
+        img = Image.new("RGB", (256, 1))
+        img.putdata([(i, 255-i, (i*7) % 256) for i in range(256)])
+        t = FadeToBlack(steps=16)
+
+        for step in range(0, 17):
+            progress = step / 16
+            factor = 1-(progress*2) if progress < 0.5 else (progress-0.5)*2
+            expected_img = ImageEnhance.Brightness(img).enhance(factor)
+            self.assertEqual(t.merge(progress, img, img).tobytes(),
+                             expected_img.tobytes())
 
+    def _test_fade_to_black_at(self, progress: float) -> Image:
+        img0, img1 = _draw_test_images()
         t = FadeToBlack()
         return t.merge(progress, img0, img1)
+
+
+class CrossfadeTransitionTest(SlideTest):
+
+    def test_50p(self) -> None:
+        self.assertImageMatchesGolden(_merge_at(Crossfade(), 0.5))
+
+
+class WipeTransitionTest(SlideTest):
+
+    def test_50p(self) -> None:
+        self.assertImageMatchesGolden(_merge_at(Wipe(), 0.5))
+
+
+class SlideTransitionTest(SlideTest):
+
+    def test_50p(self) -> None:
+        self.assertImageMatchesGolden(_merge_at(Slide(), 0.5))
+
+
+class TransitionEndpointsTest(SlideTest):
+
+    def test_start_and_end_match_inputs(self) -> None:
+        img0, img1 = _draw_test_images()
+        for t in [Crossfade(), Wipe(), Slide()]:
+            self.assertEqual(t.merge(0, img0, img1).tobytes(),
+                             img0.tobytes(), type(t).__name__)
+            self.assertEqual(t.merge(1, img0, img1).tobytes(),
+                             img1.tobytes(), type(t).__name__)
+
+
+class BlendedFrameReuseTest(SlideTest):
+
+    def test_reuses_frame_for_same_step_and_inputs(self) -> None:
+        img0, img1 = _draw_test_images()
+        for t in [FadeToBlack(steps=16), Crossfade(steps=16)]:
+            frame = t.merge(0.25, img0, img1)
+            self.assertIs(t.merge(0.26, img0, img1), frame, type(t).__name__)
+
+    def test_blends_again_for_new_inputs(self) -> None:
+        img0, img1 = _draw_test_images()
+        t = Crossfade(steps=16)
+        t.merge(0.5, img0, img1)
+
+        new_img0, new_img1 = _draw_test_images()
+        new_img1.paste(RED, (0, 0, 1, 1))
+
+        self.assertEqual(t.merge(0.5, new_img0, new_img1).tobytes(),
+                         Image.blend(new_img0, new_img1, 0.5).tobytes())
+
+
+class CreateTransitionTest(SlideTest):
+
+    def test_unknown_name(self) -> None:
+        with self.assertRaises(ValueError):
+            create_transition("dissolve")
+
+
+def _merge_at(t: Transition, progress: float) -> Image:
+    img0, img1 = _draw_test_images()
+    return t.merge(progress, img0, img1)
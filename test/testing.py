@@ -1,16 +1,16 @@
 import datetime
-import inspect
+import functools
 import unittest
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
 import requests
 from google.protobuf import message, text_format  # type: ignore
-from PIL import Image, ImageChops  # type: ignore
+from PIL import Image, ImageChops, ImageDraw  # type: ignore
 
-from abstractslide import AbstractSlide
+from abstractslide import AbstractSlide, SlideType
 from deps import Dependencies
-from drawing import create_slide
+from drawing import RED, create_slide
 from requester import Endpoint, Requester
 from timesource import TimeSource
 
@@ -65,6 +65,10 @@ class FakeRequester(Requester):
     def stop(self) -> None:
         pass
 
+    def wait_until_ready(self, timeout: float) -> bool:
+        # Responses are all handled when starting.
+        return True
+
     def expect_with_proto_response(self, url: str, file: str, message: message) -> None:
         with open("test/data/responses/" + file) as f:
             content = text_format.Parse(f.read(), message).SerializeToString()
@@ -85,6 +89,25 @@ class FakeRequester(Requester):
         self.expected_responses.pop(url, None)
 
 
+class CountingSlide(AbstractSlide):
+    key: Any
+    draw_count: int
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+        self.draw_count = 0
+
+    def get_type(self) -> SlideType:
+        return SlideType.HALF_WIDTH
+
+    def get_cache_key(self) -> Any:
+        return self.key
+
+    def draw(self, img: Image) -> None:
+        self.draw_count += 1
+        ImageDraw.Draw(img).point((self.draw_count, 0), RED)
+
+
 class TestDependencies(Dependencies):
     time_source: FakeTimeSource
 
@@ -102,6 +125,20 @@ class TestDependencies(Dependencies):
 _GOLDEN_DIR = "test/data/golden"
 
 
+@functools.lru_cache(maxsize=None)
+def _load_golden(filename: str) -> Image:
+    # Decoded once per test run. Callers must not modify the result.
+    with Image.open(filename) as img:
+        img.load()
+        return img
+
+
+def _images_equal(actual_img: Image, expected_img: Image) -> bool:
+    # Cheaper than computing a diff, which is only needed to explain a mismatch.
+    return (actual_img.mode == expected_img.mode and actual_img.size == expected_img.size
+            and actual_img.tobytes() == expected_img.tobytes())
+
+
 class SlideTest(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -113,8 +150,7 @@ class SlideTest(unittest.TestCase):
         actual_img = create_slide(slide.get_type())
         slide.draw(actual_img)
         blank_img = create_slide(slide.get_type())
-        diff = ImageChops.difference(actual_img, blank_img)
-        if diff.getbbox():
+        if actual_img.tobytes() != blank_img.tobytes():
             image_name_base = self._image_name_from_test_name()
             actual_img_filename = "%s/%s_actual.png" % (
                 _GOLDEN_DIR, image_name_base)
@@ -137,9 +173,9 @@ class SlideTest(unittest.TestCase):
         self._compare_to_golden(image_name_base, actual_img)
 
     def _image_name_from_test_name(self) -> str:
-        calling_function = inspect.stack()[2].function.replace("test_", "")
+        test_name = self._testMethodName.replace("test_", "")
         subclass = type(self).__name__.replace("Test", "")
-        return subclass + "_" + calling_function
+        return subclass + "_" + test_name
 
     def _compare_to_golden(self, image_name_base: str, actual_img: Image) -> None:
         expected_img_filename = "%s/%s_golden.png" % (
@@ -147,20 +183,22 @@ class SlideTest(unittest.TestCase):
         actual_img_filename = "%s/%s_actual.png" % (
             _GOLDEN_DIR, image_name_base)
         try:
-            with Image.open(expected_img_filename) as expected_img:
-                diff = ImageChops.difference(actual_img, expected_img)
+            expected_img = _load_golden(expected_img_filename)
+            if _images_equal(actual_img, expected_img):
+                return
 
-                if actual_img.width != expected_img.width or actual_img.height != expected_img.height:
-                    raise AssertionError("Output and golden images had different dimensions. Output: %dx%d, Golden: %dx%d" % (
-                        actual_img.width, actual_img.height, expected_img.width, expected_img.height))
+            if actual_img.width != expected_img.width or actual_img.height != expected_img.height:
+                raise AssertionError("Output and golden images had different dimensions. Output: %dx%d, Golden: %dx%d" % (
+                    actual_img.width, actual_img.height, expected_img.width, expected_img.height))
 
-                elif diff.getbbox():
-                    diff_img_filename = "%s/%s_diff.png" % (
-                        _GOLDEN_DIR, image_name_base)
-                    diff.save(diff_img_filename)
-                    actual_img.save(actual_img_filename)
-                    raise AssertionError("Output differed from %s. Saved candidate image to %s, diff to %s" % (
-                        expected_img_filename, actual_img_filename, diff_img_filename))
+            diff = ImageChops.difference(actual_img, expected_img)
+            if diff.getbbox():
+                diff_img_filename = "%s/%s_diff.png" % (
+                    _GOLDEN_DIR, image_name_base)
+                diff.save(diff_img_filename)
+                actual_img.save(actual_img_filename)
+                raise AssertionError("Output differed from %s. Saved candidate image to %s, diff to %s" % (
+                    expected_img_filename, actual_img_filename, diff_img_filename))
 
         except FileNotFoundError:
             actual_img.save(actual_img_filename)
@@ -177,17 +215,19 @@ def draw_and_compare(golden_image_name: str, slide: AbstractSlide) -> bool:
 def compare_to_golden(golden_image_name: str, actual_img: Image) -> bool:
     expected_img_filename = "test/data/golden/%s_golden.png" % golden_image_name
     try:
-        with Image.open(expected_img_filename) as expected_img:
+        expected_img = _load_golden(expected_img_filename)
+        if _images_equal(actual_img, expected_img):
+            return True
+
+        if actual_img.width != expected_img.width or actual_img.height != expected_img.height:
+            print("Output and golden images had different dimensions. Output: %dx%d, Golden: %dx%d" % (
+                actual_img.width, actual_img.height, expected_img.width, expected_img.height))
+        else:
             diff = ImageChops.difference(actual_img, expected_img)
-
-            if actual_img.width != expected_img.width or actual_img.height != expected_img.height:
-                print("Output and golden images had different dimensions. Output: %dx%d, Golden: %dx%d" % (
-                    actual_img.width, actual_img.height, expected_img.width, expected_img.height))
-            elif diff.getbbox():
-                print("Output differed from %s" % expected_img_filename)
-                diff.save("test/data/golden/%s_diff.png" % golden_image_name)
-            else:
+            if not diff.getbbox():
                 return True
+            print("Output differed from %s" % expected_img_filename)
+            diff.save("test/data/golden/%s_diff.png" % golden_image_name)
 
     except FileNotFoundError:
         print("Golden image %s does not exist" % expected_img_filename)
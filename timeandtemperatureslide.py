@@ -1,7 +1,7 @@
 import datetime
 import logging
 from json import JSONDecodeError
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 import requests
 from PIL import Image, ImageDraw  # type: ignore
@@ -118,29 +118,47 @@ class TimeAndTemperatureSlide(AbstractSlide):
     def get_type(self) -> SlideType:
         return SlideType.HALF_WIDTH
 
+    def get_cache_key(self) -> Any:
+        now = self.time_source.now()
+        # Date and time are only drawn to the minute.
+        return (now.replace(second=0, microsecond=0), self.current_temp, self.current_icon, self.current_aqi,
+                self._has_current_observations(now), self._has_current_air_quality(now))
+
+    def get_valid_until(self, now: datetime.datetime) -> Optional[datetime.datetime]:
+        # The time changes on the next minute, and observations are hidden once they go stale.
+        valid_until = now.replace(second=0, microsecond=0) + \
+            datetime.timedelta(minutes=1)
+        if self._has_current_observations(now):
+            valid_until = min(valid_until, self.last_observations_retrieval +
+                              _OBSERVATIONS_STALENESS_THRESHOLD)
+        if self._has_current_air_quality(now):
+            valid_until = min(valid_until, self.last_air_quality_retrieval +
+                              _OBSERVATIONS_STALENESS_THRESHOLD)
+        return valid_until
+
     def draw(self, img: Image) -> None:
         draw = ImageDraw.Draw(img)
         now = self.time_source.now()
 
-        observations_time_delta = self.time_source.now() - self.last_observations_retrieval
         time_y_offset = 0
-        if (self.current_temp is not None and observations_time_delta <= _OBSERVATIONS_STALENESS_THRESHOLD):
+        current_temp = self.current_temp
+        if current_temp is not None and self._has_current_observations(now):
             temperature_x_offset = 0
             if self.current_icon:
                 draw_glyph_by_name(draw, self.current_icon,
                                    0, 16, GlyphSet.WEATHER, WHITE)
                 temperature_x_offset = 18
 
-            draw_string(draw, "%d°" % self.current_temp,
+            draw_string(draw, "%d°" % current_temp,
                         temperature_x_offset, 21, Align.LEFT, GlyphSet.FONT_7PX, WHITE)
 
             # Only draw AQI if we also have weather conditions.
-            air_quality_time_delta = self.time_source.now() - self.last_air_quality_retrieval
-            if (self.current_aqi is not None and air_quality_time_delta <= _OBSERVATIONS_STALENESS_THRESHOLD):
-                if self.current_aqi > 100:
+            current_aqi = self.current_aqi
+            if current_aqi is not None and self._has_current_air_quality(now):
+                if current_aqi > 100:
                     draw_string(draw, "AQI", 50, 16, Align.CENTER,
                                 GlyphSet.FONT_7PX, RED)
-                    draw_string(draw, str(self.current_aqi),
+                    draw_string(draw, str(current_aqi),
                                 50, 24, Align.CENTER, GlyphSet.FONT_7PX, RED)
 
         else:
@@ -153,3 +171,11 @@ class TimeAndTemperatureSlide(AbstractSlide):
         time_string = now.strftime("%-I:%M %p")
         draw_string(draw, time_string, 0, time_y_offset+8,
                     Align.LEFT, GlyphSet.FONT_7PX, YELLOW)
+
+    def _has_current_observations(self, now: datetime.datetime) -> bool:
+        observations_time_delta = now - self.last_observations_retrieval
+        return self.current_temp is not None and observations_time_delta <= _OBSERVATIONS_STALENESS_THRESHOLD
+
+    def _has_current_air_quality(self, now: datetime.datetime) -> bool:
+        air_quality_time_delta = now - self.last_air_quality_retrieval
+        return self.current_aqi is not None and air_quality_time_delta <= _OBSERVATIONS_STALENESS_THRESHOLD
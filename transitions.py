@@ -1,24 +1,122 @@
 from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple, Type
 
-from PIL import Image, ImageEnhance  # type: ignore
+from PIL import Image  # type: ignore
+
+# Progress is rounded down to one of this many steps, so per-step tables and masks can be reused.
+_DEFAULT_STEPS = 64
 
 
 class Transition(ABC):
+    steps: int
+    # Frames blended from the last pair of input images, by step. Replaced as a whole when the inputs change.
+    blended_frames: Optional[Tuple[Image, Image, Dict[int, Image]]]
+
+    def __init__(self, steps: int = _DEFAULT_STEPS) -> None:
+        self.steps = steps
+        self.blended_frames = None
 
+    # Inputs must not change while they're passed in again, and the merged image must not be modified.
     @abstractmethod
     def merge(self, progress: float, img0: Image, img1: Image) -> Image:
         pass
 
+    def finish(self) -> None:
+        # Called when a transition ends, so blended frames don't keep its snapshots alive.
+        self.blended_frames = None
+
+    def _quantize(self, progress: float) -> int:
+        return max(0, min(self.steps, int(progress * self.steps)))
+
+    def _get_blended_frame(self, step: int, img0: Image, img1: Image, blend: Callable[[], Image]) -> Image:
+        # Slideshows snapshot both slides once per transition, so each step is only blended once per transition.
+        blended_frames = self.blended_frames
+        if blended_frames is None or blended_frames[0] is not img0 or blended_frames[1] is not img1:
+            blended_frames = (img0, img1, {})
+            self.blended_frames = blended_frames
+        frames = blended_frames[2]
+        if step not in frames:
+            frames[step] = blend()
+        return frames[step]
+
 
 class FadeToBlack(Transition):
+    # Black frames to blend towards, by image mode and size.
+    black_images: Dict[Tuple[str, Tuple[int, int]], Image]
+
+    def __init__(self, steps: int = _DEFAULT_STEPS) -> None:
+        super().__init__(steps)
+        self.black_images = {}
+
     def merge(self, progress: float, img0: Image, img1: Image) -> Image:
+        step = self._quantize(progress)
+        return self._get_blended_frame(step, img0, img1, lambda: self._blend(step / self.steps, img0, img1))
+
+    def _blend(self, progress: float, img0: Image, img1: Image) -> Image:
+        # Blending with black is what ImageEnhance.Brightness does, without allocating a black frame each time.
         if progress < 0.5:
-            enhancer = ImageEnhance.Brightness(img0)
             # 0 -> 1, 0.1 -> 0.8, 0.5 -> 0
             factor = 1-(progress*2)
-            return enhancer.enhance(factor)
+            return Image.blend(self._get_black_image(img0), img0, factor)
         else:
             # 0.5 -> 0, 0.9 -> 0.8, 1 -> 1
             factor = (progress-0.5)*2
-            enhancer = ImageEnhance.Brightness(img1)
-            return enhancer.enhance(factor)
+            return Image.blend(self._get_black_image(img1), img1, factor)
+
+    def _get_black_image(self, img: Image) -> Image:
+        if (img.mode, img.size) not in self.black_images:
+            self.black_images[img.mode, img.size] = Image.new(
+                img.mode, img.size)
+        return self.black_images[img.mode, img.size]
+
+
+class Crossfade(Transition):
+    def merge(self, progress: float, img0: Image, img1: Image) -> Image:
+        step = self._quantize(progress)
+        return self._get_blended_frame(step, img0, img1, lambda: Image.blend(img0, img1, step / self.steps))
+
+
+class Wipe(Transition):
+    # Masks revealing the incoming image from the left, by image size and step.
+    masks: Dict[Tuple[Tuple[int, int], int], Image]
+
+    def __init__(self, steps: int = _DEFAULT_STEPS) -> None:
+        super().__init__(steps)
+        self.masks = {}
+
+    def merge(self, progress: float, img0: Image, img1: Image) -> Image:
+        step = self._quantize(progress)
+        return Image.composite(img1, img0, self._get_mask(img0.size, step))
+
+    def _get_mask(self, size: Tuple[int, int], step: int) -> Image:
+        if (size, step) not in self.masks:
+            mask = Image.new("1", size)
+            boundary = round(size[0] * step / self.steps)
+            mask.paste(255, (0, 0, boundary, size[1]))
+            self.masks[size, step] = mask
+        return self.masks[size, step]
+
+
+class Slide(Transition):
+    def merge(self, progress: float, img0: Image, img1: Image) -> Image:
+        step = self._quantize(progress)
+        # The incoming image pushes the outgoing image off to the left.
+        offset = round(img0.width * step / self.steps)
+        merged_img = Image.new(img0.mode, img0.size)
+        merged_img.paste(img0, (-offset, 0))
+        merged_img.paste(img1, (img0.width - offset, 0))
+        return merged_img
+
+
+_TRANSITIONS_BY_NAME: Dict[str, Type[Transition]] = {
+    "fade_to_black": FadeToBlack,
+    "crossfade": Crossfade,
+    "wipe": Wipe,
+    "slide": Slide,
+}
+
+
+def create_transition(name: str, steps: int = _DEFAULT_STEPS) -> Transition:
+    if name not in _TRANSITIONS_BY_NAME:
+        raise ValueError("Unknown transition %s" % name)
+    return _TRANSITIONS_BY_NAME[name](steps)
@@ -1,5 +1,4 @@
 import logging
-import re
 from typing import Any, Optional
 
 # Defines how OpenWeather icon names match to weather glyphs.